@@ -0,0 +1,43 @@
+"""Throughput of escaping LaTeX special characters in string arrays, for the
+vectorized (unicode array) and element-by-element (object array) conversions.
+
+Run with: python src/benchmarks/bench_escape.py [n_strings]
+"""
+import numpy as np
+import sys
+import os
+import time
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex
+
+def make_strings(n, rng):
+    "n short strings, about a third containing LaTeX special characters."
+    words = np.array(["value", "total_cost", "50%", "A&B", "item #3",
+                      "plain text", "x^2", "path\\to", "{set}"])
+    return words[rng.integers(0, len(words), size=n)]
+
+def throughput(arr, **options):
+    "Return strings rendered per second."
+    start = time.perf_counter()
+    arraytex(arr, threshold=np.inf, **options)
+    return arr.size / (time.perf_counter() - start)
+
+def main(n=10**6):
+    arr = make_strings(n, np.random.default_rng(0)).reshape(-1, 100)
+    print(f"{n} strings, rendered per second:")
+    for typefont in [True, False]:
+        cases = [("unicode, escaped", arr, {}),
+                 ("unicode, contains_latex", arr, {"contains_latex": True}),
+                 ("object, escaped", arr.astype(object), {})]
+        for name, x, options in cases:
+            rate = throughput(x, strings_in_typefont=typefont, **options)
+            print(f"  strings_in_typefont={typefont!s:<5} {name:<24} "
+                  f"{rate:>12,.0f}")
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
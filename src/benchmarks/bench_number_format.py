@@ -0,0 +1,57 @@
+"""Compare the payload size and render time of float matrices shown in full
+(Python's str() formatting, the default) and with compact number formatting.
+
+Run with: python src/benchmarks/bench_number_format.py
+"""
+import numpy as np
+import sys
+import os
+import time
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import to_md, printoptions
+
+FORMATS = {"default": {},
+           "precision=3": {"precision": 3},
+           "significant=4": {"significant": 4},
+           "scientific, precision=2": {"scientific": True, "precision": 2},
+           "precision=3, suppress_small": {"precision": 3,
+                                           "suppress_small": True}}
+
+def example_matrices(rng):
+    "Typical float matrices: random normal, a correlation matrix, and the "
+    "result of a computation with floating point noise."
+    data = rng.normal(size=(500, 40))
+    yield "normal (200, 200)", rng.normal(size=(200, 200))
+    yield "corrcoef (40, 40)", np.corrcoef(data, rowvar=False)
+    yield "noisy (200, 200)", np.linalg.inv(np.linalg.inv(
+        np.eye(200) + 0.1 * rng.normal(size=(200, 200))))
+
+def payload(arr, options, repeats=3):
+    "Return (payload bytes, best seconds) for rendering arr with to_md()."
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = to_md(arr, mode="latex", **options)
+        times.append(time.perf_counter() - start)
+    return len(output.data.encode("utf-8")), min(times)
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'array':>18} {'format':>28} {'bytes':>10} {'ratio':>6} "
+          f"{'ms':>8}")
+    with printoptions(threshold=sys.maxsize):
+        for name, arr in example_matrices(rng):
+            baseline = None
+            for format_name, options in FORMATS.items():
+                size, seconds = payload(arr, options)
+                baseline = baseline or size
+                print(f"{name:>18} {format_name:>28} {size:>10} "
+                      f"{size / baseline:>6.2f} {seconds * 1000:>8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Scaling of arraytex() with the number of worker processes, for large
+object and float64 matrices (rendered in full).
+
+Run with: python src/benchmarks/bench_parallel.py [n_cells]
+"""
+import numpy as np
+import sys
+import os
+import time
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, printoptions
+
+def example_arrays(n_cells, rng):
+    n_rows = max(n_cells // 100, 1)
+    floats = rng.normal(size=(n_rows, 100))
+    mixed = floats.astype(object)
+    mixed[:, ::4] = "some text"
+    mixed[:, 1::4] = True
+    return {"object": mixed, "float64": floats}
+
+def process_counts():
+    counts, n = [], 1
+    while n < (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count() or 1]
+
+def best_time(arr, processes, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        arraytex(arr, processes=processes)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(n_cells=10**6):
+    rng = np.random.default_rng(0)
+    print(f"{n_cells} cells, {os.cpu_count()} cores")
+    print(f"{'dtype':>8} {'processes':>9} {'seconds':>8} {'speedup':>8}")
+    with printoptions(threshold=sys.maxsize):
+        for name, arr in example_arrays(n_cells, rng).items():
+            serial = None
+            for processes in process_counts():
+                # (the first call starts the worker processes)
+                with printoptions(parallel_min_cells=0):
+                    arraytex(arr[:100], processes=processes)
+                seconds = best_time(arr, processes)
+                serial = serial or seconds
+                print(f"{name:>8} {processes:>9} {seconds:>8.3f} "
+                      f"{serial / seconds:>8.2f}")
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
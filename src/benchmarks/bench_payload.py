@@ -0,0 +1,41 @@
+"""Compare the payload size (and render time) of the LaTeX and HTML table
+renderers, for square matrices of increasing size.
+
+Run with: python src/benchmarks/bench_payload.py
+"""
+import numpy as np
+import sys
+import os
+import time
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import to_md, printoptions
+
+def payload(arr, mode):
+    "Return (payload bytes, seconds) for rendering arr with to_md()."
+    start = time.perf_counter()
+    output = to_md(arr, mode=mode)
+    elapsed = time.perf_counter() - start
+    return len(output.data.encode("utf-8")), elapsed
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'array':>22} {'latex bytes':>12} {'latex ms':>9} "
+          f"{'html bytes':>12} {'html ms':>9}")
+    with printoptions(threshold=sys.maxsize):
+        for n in [10, 50, 100, 200, 500]:
+            for name, arr in [("float", rng.normal(size=(n, n))),
+                              ("int", rng.integers(0, 1000, size=(n, n))),
+                              ("str", np.full((n, n), "some text"))]:
+                latex_bytes, latex_time = payload(arr, "latex")
+                html_bytes, html_time = payload(arr, "html")
+                print(f"{name + ' ' + str(arr.shape):>22} {latex_bytes:>12} "
+                      f"{latex_time * 1000:>9.1f} {html_bytes:>12} "
+                      f"{html_time * 1000:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Per-call overhead of rendering many small arrays in a hot loop: arraytex()
+(and to_md()) against a Renderer made once, with the same options.
+
+Run with: python src/benchmarks/bench_renderer.py [n_calls]
+"""
+import numpy as np
+import sys
+import os
+import time
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, to_md, Renderer
+
+def example_arrays(rng):
+    yield "float64 (3, 3)", rng.normal(size=(3, 3))
+    yield "int64 (4,)", np.arange(4)
+    yield "float64 (10, 10)", rng.normal(size=(10, 10))
+    yield "object (3, 3)", np.array([[1, "a_b", 2.5]] * 3, dtype=object)
+
+def best_time(function, arr, n_calls, repeats=3):
+    "Best time per call, in microseconds."
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            function(arr)
+        times.append(time.perf_counter() - start)
+    return min(times) / n_calls * 1e6
+
+def main(n_calls=10000):
+    rng = np.random.default_rng(0)
+    renderer = Renderer()
+    functions = {
+        "arraytex()": arraytex,
+        "Renderer.arraytex()": renderer.arraytex,
+        "to_md()": to_md,
+        "Renderer.to_md()": renderer.to_md,
+    }
+    print(f"{'array':>18} {'function':>22} {'us/call':>8}")
+    for name, arr in example_arrays(rng):
+        for function_name, function in functions.items():
+            print(f"{name:>18} {function_name:>22} "
+                  f"{best_time(function, arr, n_calls):>8.1f}")
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
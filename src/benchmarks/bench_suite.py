@@ -0,0 +1,214 @@
+"""Benchmark suite for the jupyprint rendering pipeline.
+
+Sweeps arraytex(), to_md() and jupyprint() (with IPython's display() stubbed
+out) over array shapes, dtypes and all four `quote_strings` /
+`strings_in_typefont` combinations, recording wall time, peak memory (via
+tracemalloc) and output size. Arrays are rendered in full (summarizing is
+switched off) as LaTeX.
+
+Run the suite and save the results as JSON:
+
+    python src/benchmarks/bench_suite.py run -o results.json
+
+Compare two runs, flagging slowdowns/memory increases over the tolerance (the
+exit code is 1 if there are any regressions):
+
+    python src/benchmarks/bench_suite.py compare old.json new.json
+"""
+import argparse
+import json
+import platform
+import sys
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import jupyprint, to_md, arraytex, printoptions
+
+# the module jupyprint is defined in (rather than the package)
+module = sys.modules[jupyprint.__module__]
+
+STRING_OPTIONS = [(True, True), (True, False), (False, True), (False, False)]
+
+def make_shapes(n_cells):
+    "Shapes with (about) `n_cells` elements."
+    side = max(int(np.sqrt(n_cells)), 2)
+    return {"row": (n_cells,),
+            "column": (n_cells, 1),
+            "square": (side, side),
+            "wide": (max(side // 4, 1), side * 4),
+            "tall": (side * 4, max(side // 4, 1))}
+
+def make_array(dtype, shape, rng):
+    "An example array of one of the benchmarked dtypes."
+    size = int(np.prod(shape))
+    if dtype == "int":
+        arr = rng.integers(-1000, 1000, size=size)
+    elif dtype == "float":
+        arr = rng.normal(size=size)
+    elif dtype == "bool":
+        arr = rng.random(size) > 0.5
+    elif dtype == "unicode":
+        arr = np.array([f"word {i}" for i in range(size)])
+    elif dtype == "object-mixed":
+        examples = [1, 2.5, "some text", True]
+        arr = np.array([examples[i % 4] for i in range(size)], dtype=object)
+    else:
+        raise ValueError(f"Unknown dtype {dtype!r}.")
+    return arr.reshape(shape)
+
+def render_functions():
+    """Functions to benchmark, each taking (arr, quote_strings,
+    strings_in_typefont) and returning the output size in bytes."""
+    displayed = []
+
+    def run_arraytex(arr, q, t):
+        return len(arraytex(arr, quote_strings=q, strings_in_typefont=t))
+
+    def run_to_md(arr, q, t):
+        return len(to_md(arr, quote_strings=q, strings_in_typefont=t,
+                         mode="latex").data)
+
+    def run_jupyprint(arr, q, t):
+        jupyprint(arr, quote_strings=q, strings_in_typefont=t, mode="latex")
+        return len(displayed.pop().data)
+
+    return ({"arraytex": run_arraytex, "to_md": run_to_md,
+             "jupyprint": run_jupyprint}, displayed.append)
+
+def measure(function, arr, q, t, repeats):
+    "Return (best wall time, peak traced memory, output bytes)."
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output_bytes = function(arr, q, t)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function(arr, q, t)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak, output_bytes
+
+def run(n_cells=10000, repeats=5, dtypes=None, shapes=None, seed=0):
+    "Run the suite, returning a JSON-serializable dictionary of results."
+    rng = np.random.default_rng(seed)
+    dtypes = dtypes or ["int", "float", "bool", "unicode", "object-mixed"]
+    all_shapes = make_shapes(n_cells)
+    shapes = shapes or list(all_shapes)
+    functions, stub_display = render_functions()
+
+    results = []
+    original_display = module.display
+    module.display = stub_display
+    try:
+        with printoptions(threshold=sys.maxsize):
+            for shape_name in shapes:
+                for dtype in dtypes:
+                    arr = make_array(dtype, all_shapes[shape_name], rng)
+                    for q, t in STRING_OPTIONS:
+                        for name, function in functions.items():
+                            wall, peak, size = measure(function, arr, q, t,
+                                                       repeats)
+                            results.append({"function": name,
+                                            "shape": shape_name,
+                                            "dtype": dtype,
+                                            "quote_strings": q,
+                                            "strings_in_typefont": t,
+                                            "time_s": wall,
+                                            "peak_bytes": peak,
+                                            "output_bytes": size})
+    finally:
+        module.display = original_display
+
+    return {"meta": {"python": platform.python_version(),
+                     "numpy": np.__version__,
+                     "platform": platform.platform(),
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                     "n_cells": n_cells,
+                     "repeats": repeats},
+            "results": results}
+
+def result_key(result):
+    return (result["function"], result["shape"], result["dtype"],
+            result["quote_strings"], result["strings_in_typefont"])
+
+def compare(old, new, tolerance=0.1):
+    """Compare two runs, returning a list of (key, description) regressions:
+    time or peak memory increases over the tolerance, and changed output
+    sizes."""
+    old_results = {result_key(r): r for r in old["results"]}
+    regressions = []
+    for result in new["results"]:
+        key = result_key(result)
+        before = old_results.get(key)
+        if before is None:
+            continue
+        for field in ["time_s", "peak_bytes"]:
+            if result[field] > before[field] * (1 + tolerance):
+                ratio = result[field] / max(before[field], 1e-12)
+                regressions.append((key, f"{field} {before[field]:.4g} -> "
+                                         f"{result[field]:.4g} ({ratio:.2f}x)"))
+        if result["output_bytes"] != before["output_bytes"]:
+            regressions.append((key, f"output_bytes {before['output_bytes']}"
+                                     f" -> {result['output_bytes']}"))
+    return regressions
+
+def print_results(data):
+    print(f"{'function':>10} {'shape':>7} {'dtype':>13} {'q':>2} {'t':>2} "
+          f"{'time ms':>9} {'peak KiB':>9} {'bytes':>9}")
+    for r in data["results"]:
+        print(f"{r['function']:>10} {r['shape']:>7} {r['dtype']:>13} "
+              f"{r['quote_strings']:>2d} {r['strings_in_typefont']:>2d} "
+              f"{r['time_s'] * 1000:>9.2f} {r['peak_bytes'] / 1024:>9.1f} "
+              f"{r['output_bytes']:>9}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark suite")
+    run_parser.add_argument("-o", "--output", help="JSON file for results")
+    run_parser.add_argument("--cells", type=int, default=10000,
+                            help="number of elements per array")
+    run_parser.add_argument("--repeats", type=int, default=5,
+                            help="timing repeats (the best is kept)")
+    run_parser.add_argument("--quick", action="store_true",
+                            help="small arrays and a single repeat")
+
+    compare_parser = commands.add_parser("compare",
+                                         help="flag regressions between runs")
+    compare_parser.add_argument("old", help="JSON results of the baseline")
+    compare_parser.add_argument("new", help="JSON results to check")
+    compare_parser.add_argument("--tolerance", type=float, default=0.1,
+                                help="allowed fractional increase")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        if args.quick:
+            args.cells, args.repeats = 1000, 1
+        data = run(n_cells=args.cells, repeats=args.repeats)
+        print_results(data)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(data, f, indent=1)
+        return 0
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare(old, new, tolerance=args.tolerance)
+    for key, description in regressions:
+        print("REGRESSION", "/".join(str(k) for k in key), description)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,4 +2,10 @@
 """
 __version__ = "0.1.7"
 
-from .jupyprint import jupyprint, to_md, arraytex
+from .jupyprint import (jupyprint, jupyprint_many, batch, to_md, arraytex,
+                        arrayhtml, dataframetex, dataframehtml,
+                        set_printoptions, get_printoptions,
+                        printoptions, stats, enable_stats, disable_stats,
+                        collect_stats, RenderCache, render_cache,
+                        LiveDisplay, ajupyprint, to_md_async, Renderer,
+                        DocumentWriter, export)
@@ -1,18 +1,178 @@
-from IPython.display import Markdown, display
-import pandas as pd
+from collections import OrderedDict
+from contextlib import contextmanager
+import functools
+import hashlib
+import itertools
+import math
+import os
+import sys
+import threading
+import time
+import uuid
+import weakref
+
 import numpy as np
 
+# IPython and pandas (and asyncio) are imported lazily (see display(),
+# _is_dataframe() and _render_async()), to keep `import jupyprint` fast
+
+# Global print options, see set_printoptions()
+_print_options = {
+    "threshold": 1000,
+    "edgeitems": 3,
+    "latex_max_cells": 2500,
+    "latex_max_chars": 100000,
+    "precision": None,
+    "significant": None,
+    "scientific": False,
+    "suppress_small": False,
+    "processes": 1,
+    "parallel_min_cells": 100000,
+    "max_rows": 20,
+    "max_columns": 20,
+    "max_depth": 5,
+    "max_items": 50,
+}
+
+# Incremented whenever the global print options change, so Renderers know to
+# resolve their options again
+_print_options_version = 0
+
+# ==============================================================================
+# PROFILING
+
+# Whether any stats are being collected, see enable_stats()/collect_stats()
+_profiling = False
+
+class _Stats:
+    # Totals of per-call profiling records, see stats()
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.stages = {}
+            self.elements = 0
+            self.output_bytes = 0
+            self.total_s = 0.0
+
+    def add(self, record):
+        with self._lock:
+            function = record["function"]
+            self.calls[function] = self.calls.get(function, 0) + 1
+            for stage, seconds in record["stages"].items():
+                totals = self.stages.setdefault(stage,
+                                                {"count": 0, "total_s": 0.0})
+                totals["count"] += 1
+                totals["total_s"] += seconds
+            self.elements += record["elements"]
+            self.output_bytes += record["output_bytes"]
+            self.total_s += record["total_s"]
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self):
+        with self._lock:
+            return {"calls": dict(self.calls),
+                    "stages": {stage: dict(totals)
+                               for stage, totals in self.stages.items()},
+                    "elements": self.elements,
+                    "output_bytes": self.output_bytes,
+                    "total_s": self.total_s}
+
+# Global stats (see enable_stats()), and those of active collect_stats() blocks
+_global_stats = _Stats()
+_stats_collectors = []
+
+# Per-thread stack of the records of profiled calls in progress
+_profile_local = threading.local()
+
+def _update_profiling():
+    global _profiling
+    _profiling = _global_stats.enabled or bool(_stats_collectors)
+
+def _record_stack():
+    stack = getattr(_profile_local, "stack", None)
+    if stack is None:
+        stack = _profile_local.stack = []
+    return stack
+
+def _profiled(func):
+    # Record a profiling record for (outermost) calls of `func`, when stats
+    # are being collected. Nested profiled calls add to the outer record.
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profiling:
+            return func(*args, **kwargs)
+        stack = _record_stack()
+        if stack:
+            result = func(*args, **kwargs)
+            _set_output_bytes(stack[-1], result)
+            return result
+
+        record = {"function": name, "stages": {}, "elements": 0,
+                  "output_bytes": 0}
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            stack.pop()
+        record["total_s"] = time.perf_counter() - start
+        _set_output_bytes(record, result)
+        if _global_stats.enabled:
+            _global_stats.add(record)
+        for collector in list(_stats_collectors):
+            collector.add(record)
+        return result
+    return wrapper
+
+def _set_output_bytes(record, result):
+    # Markdown objects have `data`, LaTeX/HTML is returned as a string
+    data = getattr(result, "data", result)
+    if isinstance(data, str):
+        record["output_bytes"] = len(data.encode("utf-8"))
+
+def _stage_start():
+    # Start time of a profiled stage, None if stats are not being collected
+    return time.perf_counter() if _profiling else None
+
+def _stage_end(stage, start, elements=0):
+    # Add the time since `start` to `stage` of the current profiling record
+    if start is None:
+        return
+    stack = _record_stack()
+    if stack:
+        record = stack[-1]
+        record["stages"][stage] = (record["stages"].get(stage, 0.0)
+                                   + time.perf_counter() - start)
+        record["elements"] += elements
+
 # ==============================================================================
 # USER FACING FUNCTIONS
 
+@_profiled
 def jupyprint(x, quote_strings=True, strings_in_typefont=True, 
-              return_raw_string=False):
+              return_raw_string=False, display_id=None, mode="auto",
+              contains_latex=False, precision=None, significant=None,
+              scientific=None, suppress_small=None):
     """ Nice-looking Jupyter notebook display for value x.
 
     This function will display the value as Markdown/LaTeX if `x` is of type
     string, LaTeX string, number (int, float, complex), boolean, list,
-    dictionary, tuple, or a 1D/2D numpy array. If `x` is a pandas.DataFrame, it
-    will be rendered as HTML.
+    dictionary, tuple, or a numpy array (arrays with more than two dimensions
+    are shown as a matrix for each 2D slice). If `x` is a pandas.DataFrame, it
+    will be rendered as an HTML table (see dataframehtml()). Lists, tuples and
+    dictionaries are shown as LaTeX: sequences of numbers as vectors or
+    matrices (see arraytex()), dictionaries as key/value tables, with large
+    and deeply nested containers summarized (see set_printoptions()).
 
     Parameters
     ----------
@@ -20,13 +180,16 @@ def jupyprint(x, quote_strings=True, strings_in_typefont=True,
         numpy.ndarray or pandas.DataFrame
         The input data to be printed. x can be a string, LaTeX string, a number
         (int, float, complex), a boolean, a list, a dictionary, a tuple, a 1D 
-        numpy array  (row or column vector), a 2D numpy array or a 
-        pandas.DataFrame. Numpy arrays can contain elements of any dtype - bools
+        numpy array  (row or column vector), a 2D (or N-D) numpy array or a 
+        pandas.DataFrame (scipy.sparse matrices are also shown, as matrices,
+        without being converted to dense arrays). Numpy arrays can contain
+        elements of any dtype - bools
         and strings will be shown as text in LaTeX (if the array contains mixed
         datatypes, ensure you use "dtype = object" when constructing the array -
         otherwise all elements will be shown as strings). If x is a 
-        pandas.DataFrame it will be printed in HTML, all other input types will
-        be printed as Markdown/LaTeX.
+        pandas.DataFrame it will be printed in HTML (or LaTeX, see `mode`),
+        all other input types will be printed as Markdown/LaTeX. Large numpy
+        arrays and DataFrames are summarized (see set_printoptions()).
     quote_strings : {False, True}
         Whether to add quotes around strings in output, where the output is a
         vector or matrix. Default is True.
@@ -38,6 +201,22 @@ def jupyprint(x, quote_strings=True, strings_in_typefont=True,
         Markdown. This is useful if you want to put the equation etc. in a 
         Markdown cell of a Jupyter notebook, but containing variables/data from
         a code cell. Default is False.
+    display_id : str, optional
+        If given, the output replaces the previous output printed with the same
+        `display_id`, rather than adding a new output. Updates are throttled
+        and skipped when the value has not changed, see LiveDisplay.
+        `return_raw_string` is ignored for these updates. Default is None.
+    mode : {"auto", "latex", "html"}
+        How numpy arrays are rendered: as a LaTeX matrix, or as an HTML table
+        (which the browser can show far faster than MathJax can typeset a
+        large matrix). "auto" uses LaTeX, unless the matrix is too large (see
+        set_printoptions()). Default is "auto".
+    contains_latex : {False, True}
+        Whether strings in numpy arrays are LaTeX, to be rendered as they are,
+        see arraytex(). Default is False.
+    precision, significant, scientific, suppress_small : optional
+        How floating point (and complex) elements of numpy arrays are
+        formatted, see arraytex(). Default to the global print options.
 
     Returns
     -------
@@ -85,13 +264,95 @@ def jupyprint(x, quote_strings=True, strings_in_typefont=True,
     >>> y = np.array([[1000], [-889], [43]])
     >>> jupyprint(f"{arraytex(x)} * {arraytex(y)} = {arraytex(np.dot(x, y))}")
     """
-    # jupyprint the input
-    display(to_md(x, quote_strings=quote_strings, 
-                  strings_in_typefont=strings_in_typefont,
-                  return_raw_string=return_raw_string))
+    _renderer(quote_strings, strings_in_typefont, contains_latex, mode, None,
+              None, precision, significant, scientific, suppress_small,
+              None).display(x, return_raw_string=return_raw_string,
+                            display_id=display_id)
+
+@_profiled
+def jupyprint_many(xs, quote_strings=True, strings_in_typefont=True,
+                   return_raw_string=False, max_bytes=None, mode="auto",
+                   contains_latex=False, precision=None, significant=None,
+                   scientific=None, suppress_small=None):
+    """ jupyprint() each value in `xs`, as a single combined display output.
+
+    This is equivalent to calling jupyprint() on each value inside a `with
+    batch():` block, see batch().
+
+    Parameters
+    ----------
+    xs : iterable
+        The values to be printed, in order. Each value can be any input
+        accepted by jupyprint().
+    quote_strings, strings_in_typefont, return_raw_string : {False, True}
+        As for jupyprint(), applied to every value.
+    max_bytes : int, optional
+        Size of the combined output (in bytes, UTF-8 encoded) after which it is
+        displayed and a new output started, see batch().
+    mode : {"auto", "latex", "html"}
+        As for jupyprint(), applied to every value.
+    contains_latex : {False, True}
+        As for jupyprint(), applied to every value.
+    precision, significant, scientific, suppress_small : optional
+        As for jupyprint(), applied to every value.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> jupyprint_many(["Some matrices:"] + [np.eye(2) * i for i in range(5)])
+    """
+    renderer = _renderer(quote_strings, strings_in_typefont, contains_latex,
+                         mode, None, None, precision, significant, scientific,
+                         suppress_small, None)
+    with batch(max_bytes=max_bytes):
+        for x in xs:
+            renderer.display(x, return_raw_string=return_raw_string)
+
+@contextmanager
+def batch(max_bytes=None):
+    """Context manager collecting the output of jupyprint() calls, to display
+    them together as one Markdown output.
+
+    Each display() sends a separate message to the notebook frontend, so
+    printing many small values in a loop can be slow (especially with a remote
+    kernel). Within a `with batch():` block, jupyprint() outputs are combined
+    in order and displayed when the block exits, or whenever the combined output reaches
+    `max_bytes`. Nested batches are merged into the outermost batch.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Size of the combined output (in bytes, UTF-8 encoded) after which it is
+        displayed and a new output started. Default is 1 MiB.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import jupyprint, batch
+    >>> with batch():
+    ...     for i in range(500):
+    ...         jupyprint(f"Iteration {i}:")
+    ...         jupyprint(np.eye(2) * i)
+    """
+    if _batches:
+        yield _batches[-1]
+        return
+    _batches.append(_Batch(_BATCH_MAX_BYTES if max_bytes is None
+                           else max_bytes))
+    try:
+        yield _batches[-1]
+    finally:
+        _batches.pop().flush()
 
+@_profiled
 def to_md(x, quote_strings=True, strings_in_typefont=True,
-          return_raw_string=False):
+          return_raw_string=False, mode="auto", contains_latex=False,
+          precision=None, significant=None, scientific=None,
+          suppress_small=None):
     """
     Build a Markdown object for input value `x`. 
 
@@ -99,10 +360,7 @@ def to_md(x, quote_strings=True, strings_in_typefont=True,
     ----------
     x : str or int or float or complex or bool or list or dict or tuple or 
         numpy.ndarray or pandas.DataFrame
-        The input data to be converted to a Markdown object (where necessary
-        for nice-looking printing in a Jupyter notebook e.g. pandas.DataFrame
-        inputs do not need to be converted to Markdown, but other input types
-        do).
+        The input data to be converted to a Markdown object.
     quote_strings : {False, True}
         Whether to add quotes around strings in output, where the output is a
         vector or matrix.
@@ -114,46 +372,53 @@ def to_md(x, quote_strings=True, strings_in_typefont=True,
         Markdown. This is useful if you want to put the equation etc. in a 
         Markdown cell of a Jupyter notebook, but containing variables/data from
         a code cell. Default is False.
+    mode : {"auto", "latex", "html"}
+        Whether numpy arrays are rendered as a LaTeX matrix or an HTML table.
+        "auto" uses LaTeX, unless the number of elements shown exceeds the
+        `latex_max_cells` print option, or the LaTeX exceeds
+        `latex_max_chars` characters (see set_printoptions()). Default is
+        "auto".
+    contains_latex : {False, True}
+        Whether strings in numpy arrays are LaTeX, to be rendered as they are,
+        see arraytex(). Default is False.
+    precision, significant, scientific, suppress_small : optional
+        How floating point (and complex) elements of numpy arrays are
+        formatted, see arraytex(). Default to the global print options.
 
     Returns
     -------
-    IPython.core.display.Markdown object or pandas.DataFrame
+    IPython.core.display.Markdown object
         Returns built Markdown of the input value x, for display in a Jupyter 
-        notebook using the jupyprint() function. Unless x is a pandas.DataFrame,
-        then it will be returned as a pandas.DataFrame.
+        notebook using the jupyprint() function. pandas.DataFrames are
+        rendered as an HTML table (see dataframehtml()), or as a LaTeX array
+        when `mode="latex"` (see dataframetex()). Lists, tuples and dicts are
+        rendered as LaTeX, see jupyprint().
     """
-    # If input is a bool, string, dict, list, tuple or number, display  as 
-    # markdown/LaTeX (will also work for strings with LaTeX syntax e.g. these 
-    # will be printed as LaTeX)
-    if (isinstance(x, (bool, np.bool_, str, np.str_, dict, list, tuple, int,
-                       float, complex))):
-        if return_raw_string == True:
-            print(str(x))
-        return Markdown(str(x)) 
-    
-    # If input is a numpy array convert to markdown/LaTeX, then display
-    elif (isinstance(x, np.ndarray)):
-        output = f"${arraytex(x, quote_strings=quote_strings, strings_in_typefont=strings_in_typefont)}$"
-        if return_raw_string == True:
-            print(output)
-        return Markdown(output)
-
-    # If the input is a pandas DataFrame, display it nicely rendered
-    elif (isinstance(x, pd.core.frame.DataFrame)):
-        return x
+    return _renderer(quote_strings, strings_in_typefont, contains_latex,
+                     mode, None, None, precision, significant, scientific,
+                     suppress_small, None).to_md(
+                         x, return_raw_string=return_raw_string)
 
     # The functions below are adapted from np2latex:
     # https://github.com/madrury/np2latex/blob/master/np2latex/np2latex.py
 
+@_profiled
 def arraytex(arr, quote_strings=True, strings_in_typefont=True, 
-             contains_latex=False):
-    """Convert a 1D or 2D numpy array to latex markdown. You will need this if
+             contains_latex=False, threshold=None, edgeitems=None,
+             precision=None, significant=None, scientific=None,
+             suppress_small=None, processes=None):
+    """Convert a numpy array to latex markdown. You will need this if
     you are using f-strings with multiple arrays, see the examples below.
 
+    1D and 2D arrays are shown as a vector/matrix. Arrays with more dimensions
+    are shown as a matrix for each 2D slice along their leading axes, labelled
+    with its index (e.g. `[0, :, :]`), one below the other.
+
     Parameters
     ----------
-    arr: array, shape (n, p), (n,) or (1, n)
-        A numpy array.
+    arr: array, shape (n, p), (n,), (1, n) or (..., n, p)
+        A numpy array, or a scipy.sparse matrix (which is rendered without
+        being converted to a dense array).
     
     quote_strings : {False, True}
         Whether to add quotes around strings in output. Default is True.
@@ -164,10 +429,53 @@ def arraytex(arr, quote_strings=True, strings_in_typefont=True,
     contains_latex  : {False, True}
         If the array contains LaTeX strings, `contains_latex` should be set to
         True. This will ensure that LaTeX elements render correctly, by
-        overriding `quote_strings` and `strings_in_typefont`. Alternatively,
-        `quote_strings` and `strings_in_typefont` can both be set to False to
-        ensure proper rendering of latex elements - this is what 
-        `contains_latex` does behind the scenes...
+        overriding `quote_strings` and `strings_in_typefont` (setting both to
+        False), and by not escaping LaTeX special characters (`_`, `%`, `&`,
+        `#`, `$`, `{`, `}`, `\\`, `^` and `~`) in strings, which are
+        otherwise escaped so they are shown as they are.
+
+    threshold : int, optional
+        Total number of array elements above which the output is summarized,
+        showing only the first and last `edgeitems` rows/columns with LaTeX
+        ellipses in between. For arrays with more than two dimensions, only
+        the first and last `edgeitems` slices along each leading axis are
+        shown, and slices in the middle are left out, so that at most about
+        `threshold` elements are shown in total. Defaults to the global print
+        option (see set_printoptions()).
+
+    edgeitems : int, optional
+        Number of rows/columns shown at the start and end of each dimension of
+        a summarized array. Defaults to the global print option (see
+        set_printoptions()).
+
+    precision : int or False, optional
+        Number of digits after the decimal point that floating point (and
+        complex) elements are rounded to. Trailing zeros are not shown, so
+        0.30000000000000004 is shown as 0.3. False shows floats in full, as
+        Python's str() does. Defaults to the global print option (see
+        set_printoptions()), which is False.
+
+    significant : int or False, optional
+        Number of significant digits that floating point elements are rounded
+        to, instead of `precision`. False to use `precision`. Defaults to the
+        global print option, which is False.
+
+    scientific : {None, False, True}
+        Whether to show floating point elements in scientific notation (e.g.
+        1.5e-07), with `precision` digits after the decimal point (8 if not
+        set). Defaults to the global print option, which is False.
+
+    suppress_small : {None, False, True}
+        Whether to show floating point elements which are smaller in magnitude
+        than 10^-`precision` (10^-8 if not set) as zero. Defaults to the
+        global print option, which is False.
+
+    processes : int, optional
+        Number of worker processes to convert the elements of large arrays
+        in, a block of rows each (1 converts them in this process). Arrays
+        with fewer elements shown than the `parallel_min_cells` print option
+        are always converted in this process. Defaults to the global print
+        option (see set_printoptions()), which is 1.
 
     Returns
     -------
@@ -181,93 +489,2683 @@ def arraytex(arr, quote_strings=True, strings_in_typefont=True,
     >>> y = np.array([[True], [False], [True]])
     >>> jupyprint(f"${arraytex(x)} * {arraytex(y)} = {arraytex(np.dot(x, y))}$")
     """
-    # Override other arguments, if contains_latex == True
+    return _renderer(quote_strings, strings_in_typefont, contains_latex,
+                     "auto", threshold, edgeitems, precision, significant,
+                     scientific, suppress_small, processes).arraytex(arr)
+
+@_profiled
+def arrayhtml(arr, quote_strings=True, strings_in_typefont=True,
+              threshold=None, edgeitems=None, precision=None,
+              significant=None, scientific=None, suppress_small=None):
+    """Convert a numpy array to an HTML table. This is the counterpart of
+    arraytex(), used by jupyprint() for matrices too large for MathJax to
+    typeset quickly. Arrays with more than two dimensions are shown as a table
+    for each 2D slice along their leading axes, captioned with its index.
+
+    Parameters
+    ----------
+    arr: array, shape (n, p), (n,), (1, n) or (..., n, p)
+        A numpy array, or a scipy.sparse matrix.
+
+    quote_strings : {False, True}
+        Whether to add quotes around strings in output. Default is True.
+
+    strings_in_typefont : {False, True}
+        Whether to show strings in "typewriter" font. Default is True.
+
+    threshold : int, optional
+        As for arraytex().
+
+    edgeitems : int, optional
+        As for arraytex().
+
+    precision, significant, scientific, suppress_small : optional
+        As for arraytex().
+
+    Returns
+    -------
+    html: string
+        An HTML string.
+
+    Examples
+    --------
+    >>> from jupyprint import jupyprint, arrayhtml
+    >>> x = np.random.normal(size=(200, 200))
+    >>> jupyprint(arrayhtml(x))
+    """
+    if threshold is None:
+        threshold = _print_options["threshold"]
+    if edgeitems is None:
+        edgeitems = _print_options["edgeitems"]
+    number_format = _number_format(precision, significant, scientific,
+                                   suppress_small)
+    if arr.ndim == 0:
+        raise ValueError("Array must have at least one dimension.")
+    numbers_dtype = _numbers_dtype(arr, number_format, threshold, edgeitems)
+    cell_function = functools.partial(_html_cells,
+                                      number_format=number_format,
+                                      numbers_dtype=numbers_dtype)
+
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    elif arr.ndim > 2:
+        return "".join(_iter_arrayhtml(arr, quote_strings=quote_strings,
+                           strings_in_typefont=strings_in_typefont,
+                           threshold=threshold, edgeitems=edgeitems,
+                           number_format=number_format,
+                           numbers_dtype=numbers_dtype))
+
+    # The (optional) closing tags of rows and cells are left out, to keep the
+    # payload small
+    rows = []
+    for cells in _iter_cell_blocks(arr, cell_function, _HTML_ELLIPSES,
+                                   quote_strings=quote_strings,
+                                   strings_in_typefont=strings_in_typefont,
+                                   threshold=threshold, edgeitems=edgeitems):
+        start = _stage_start()
+        rows.extend(["<tr><td>" + "<td>".join(row) for row in cells])
+        _stage_end("join", start)
+
+    start = _stage_start()
+    table = '<table class="jupyprint">' + "".join(rows) + "</table>"
+    _stage_end("join", start)
+    return table
+
+@_profiled
+def dataframetex(df, quote_strings=True, strings_in_typefont=True,
+                 contains_latex=False, environment="array", max_rows=None,
+                 max_columns=None, precision=None, significant=None,
+                 scientific=None, suppress_small=None):
+    """Convert a pandas.DataFrame to LaTeX.
+
+    Only the rows and columns shown are formatted (a column at a time, as
+    arraytex() formats arrays), so the time taken does not depend on the
+    number of rows of the DataFrame.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame to convert.
+
+    quote_strings, strings_in_typefont, contains_latex : {False, True}
+        As for arraytex().
+
+    environment : {"array", "tabular", "bmatrix"}
+        "array" (which MathJax can show) and "tabular" (for LaTeX documents,
+        where it is not in math mode) show the index and column labels, with
+        lines between them and the values. "bmatrix" shows the values only,
+        as arraytex() does. Default is "array".
+
+    max_rows : int, optional
+        Number of rows above which only the first and last rows (`max_rows`
+        in total) are shown, with ellipses in between. Defaults to the global
+        print option (see set_printoptions()).
+
+    max_columns : int, optional
+        As `max_rows`, for columns.
+
+    precision, significant, scientific, suppress_small : optional
+        As for arraytex().
+
+    Returns
+    -------
+    latex: string
+        A latex string.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from jupyprint import jupyprint, dataframetex
+    >>> df = pd.DataFrame({"x": [1.5, 2.5], "label": ["a", "b"]})
+    >>> jupyprint(f"${dataframetex(df)}$")
+    """
+    if environment not in ("array", "tabular", "bmatrix"):
+        raise ValueError('environment must be one of "array", "tabular" or '
+                         '"bmatrix".')
+    escape = True
     if contains_latex == True:
         quote_strings = False
         strings_in_typefont = False
+        escape = False
+    cell_function = functools.partial(_latex_cells,
+        quote_strings=quote_strings, strings_in_typefont=strings_in_typefont,
+        escape=escape, number_format=_number_format(precision, significant,
+                                                    scientific,
+                                                    suppress_small))
+    cells, row_labels, column_labels = _dataframe_cells(df, cell_function,
+        _LATEX_ELLIPSES, max_rows, max_columns)
+
+    start = _stage_start()
+    if environment == "bmatrix":
+        rows = [" & ".join(row) + r" \\" for row in cells]
+        latex = "\\begin{bmatrix}{} " + " ".join(rows) + " \\end{bmatrix}"
+        _stage_end("join", start)
+        return latex
+
+    # Labels are text, and (in a tabular) the cells are in math mode
+    h_ellipsis, v_ellipsis, _ = _LATEX_ELLIPSES
+    if environment == "array":
+        label = lambda text: r"\text{" + _escape_latex(text, False) + "}"
+    else:
+        label = lambda text: _escape_latex(text, False)
+        cells = [["$" + cell + "$" for cell in row] for row in cells]
+        h_ellipsis, v_ellipsis = f"${h_ellipsis}$", f"${v_ellipsis}$"
+    header = "".join([" & " + (h_ellipsis if text is None else label(text))
+                      for text in column_labels]) + r" \\ \hline"
+    rows = [(v_ellipsis if text is None else label(text))
+            + "".join([" & " + cell for cell in row]) + r" \\"
+            for text, row in zip(row_labels, cells)]
+    latex = ("\\begin{" + environment + "}{r|" + "r" * len(column_labels)
+             + "} " + " ".join([header] + rows) + " \\end{" + environment
+             + "}")
+    _stage_end("join", start)
+    return latex
+
+@_profiled
+def dataframehtml(df, quote_strings=True, strings_in_typefont=True,
+                  max_rows=None, max_columns=None, precision=None,
+                  significant=None, scientific=None, suppress_small=None):
+    """Convert a pandas.DataFrame to an HTML table, with the index and column
+    labels. This is the counterpart of dataframetex(), used by jupyprint() to
+    show DataFrames.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame to convert.
+
+    quote_strings, strings_in_typefont : {False, True}
+        As for arrayhtml().
+
+    max_rows, max_columns : int, optional
+        As for dataframetex().
+
+    precision, significant, scientific, suppress_small : optional
+        As for arraytex().
+
+    Returns
+    -------
+    html: string
+        An HTML string.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pandas as pd
+    >>> from jupyprint import jupyprint, dataframehtml
+    >>> df = pd.DataFrame(np.random.normal(size=(10**6, 4)))
+    >>> jupyprint(dataframehtml(df, precision=3))
+    """
+    cell_function = functools.partial(_html_cells,
+        quote_strings=quote_strings, strings_in_typefont=strings_in_typefont,
+        number_format=_number_format(precision, significant, scientific,
+                                     suppress_small))
+    cells, row_labels, column_labels = _dataframe_cells(df, cell_function,
+        _HTML_ELLIPSES, max_rows, max_columns)
+
+    # As for arrayhtml(), optional closing tags are left out
+    start = _stage_start()
+    h_ellipsis, v_ellipsis, _ = _HTML_ELLIPSES
+    header = "<tr><th>" + "".join(["<th>" + (h_ellipsis if text is None
+                                             else _escape_html(text))
+                                   for text in column_labels])
+    rows = ["<tr><th>" + (v_ellipsis if text is None else _escape_html(text))
+            + "".join(["<td>" + cell for cell in row])
+            for text, row in zip(row_labels, cells)]
+    html = '<table class="jupyprint">' + header + "".join(rows) + "</table>"
+    _stage_end("join", start)
+    return html
+
+def set_printoptions(threshold=None, edgeitems=None, latex_max_cells=None,
+                     latex_max_chars=None, precision=None, significant=None,
+                     scientific=None, suppress_small=None, processes=None,
+                     parallel_min_cells=None, max_rows=None,
+                     max_columns=None, max_depth=None, max_items=None):
+    """Set global print options for numpy arrays, in the style of
+    numpy.set_printoptions(). Options which are not given are left unchanged.
+
+    Parameters
+    ----------
+    threshold : int, optional
+        Total number of array elements above which arrays are summarized,
+        showing only the first and last `edgeitems` rows/columns, with LaTeX
+        ellipses (\\cdots, \\vdots, \\ddots) in between. Default is 1000.
+        Use `sys.maxsize` to always show every element.
+    edgeitems : int, optional
+        Number of rows/columns shown at the start and end of each dimension of
+        a summarized array. Default is 3.
+    latex_max_cells : int, optional
+        Number of elements shown (after any summarizing) above which
+        jupyprint()/to_md() render arrays as HTML tables rather than LaTeX,
+        when `mode="auto"`. Default is 2500.
+    latex_max_chars : int, optional
+        Length of LaTeX above which jupyprint()/to_md() render arrays as HTML
+        tables instead, when `mode="auto"`. Default is 100000.
+    precision : int or False, optional
+        Number of digits after the decimal point that floating point elements
+        are rounded to, see arraytex(). False (the default) shows floats in
+        full.
+    significant : int or False, optional
+        Number of significant digits that floating point elements are rounded
+        to, instead of `precision`, see arraytex(). Default is False.
+    scientific : {False, True}, optional
+        Whether to show floating point elements in scientific notation, see
+        arraytex(). Default is False.
+    suppress_small : {False, True}, optional
+        Whether to show tiny floating point elements as zero, see arraytex().
+        Default is False.
+    processes : int, optional
+        Number of worker processes that arraytex() converts the elements of
+        large arrays in. Default is 1 (no worker processes).
+    parallel_min_cells : int, optional
+        Number of elements shown below which arrays are converted in this
+        process, whatever `processes` is. Default is 100000.
+    max_rows : int, optional
+        Number of rows of pandas.DataFrames above which only the first and
+        last rows are shown. Default is 20.
+    max_columns : int, optional
+        Number of columns of pandas.DataFrames above which only the first and
+        last columns are shown. Default is 20.
+    max_depth : int, optional
+        Number of levels of nested lists, tuples and dicts shown, below which
+        containers are elided. Default is 5.
+    max_items : int, optional
+        Number of items of a list, tuple or dict above which only the first
+        and last items are shown. Default is 50.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import jupyprint, set_printoptions
+    >>> set_printoptions(threshold=100, edgeitems=2)
+    >>> jupyprint(np.arange(1000))
+    >>> set_printoptions(precision=3, suppress_small=True)
+    >>> jupyprint(np.random.normal(size=(3, 3)))
+    """
+    global _print_options_version
+    # Validate every option before setting any, so an invalid option leaves
+    # the print options unchanged
+    options = {}
+    if threshold is not None:
+        if threshold < 0:
+            raise ValueError("threshold must be non-negative.")
+        options["threshold"] = threshold
+    if edgeitems is not None:
+        if edgeitems < 1:
+            raise ValueError("edgeitems must be at least 1.")
+        options["edgeitems"] = edgeitems
+    if latex_max_cells is not None:
+        options["latex_max_cells"] = latex_max_cells
+    if latex_max_chars is not None:
+        options["latex_max_chars"] = latex_max_chars
+    if precision is not None:
+        _check_digits("precision", precision, 0)
+        options["precision"] = None if precision is False else precision
+    if significant is not None:
+        _check_digits("significant", significant, 1)
+        options["significant"] = None if significant is False else significant
+    if scientific is not None:
+        options["scientific"] = scientific == True
+    if suppress_small is not None:
+        options["suppress_small"] = suppress_small == True
+    if processes is not None:
+        if processes < 1:
+            raise ValueError("processes must be at least 1.")
+        options["processes"] = processes
+    if parallel_min_cells is not None:
+        options["parallel_min_cells"] = parallel_min_cells
+    if max_rows is not None:
+        if max_rows < 2:
+            raise ValueError("max_rows must be at least 2.")
+        options["max_rows"] = max_rows
+    if max_columns is not None:
+        if max_columns < 2:
+            raise ValueError("max_columns must be at least 2.")
+        options["max_columns"] = max_columns
+    if max_depth is not None:
+        if max_depth < 1:
+            raise ValueError("max_depth must be at least 1.")
+        options["max_depth"] = max_depth
+    if max_items is not None:
+        if max_items < 2:
+            raise ValueError("max_items must be at least 2.")
+        options["max_items"] = max_items
+    _print_options.update(options)
+    _print_options_version += 1
+
+def get_printoptions():
+    """Return a copy of the current global print options.
+
+    Returns
+    -------
+    options : dict
+        Dictionary of the current print options, see set_printoptions().
+    """
+    return dict(_print_options)
+
+@contextmanager
+def printoptions(**options):
+    """Context manager for temporarily setting print options, in the style of
+    numpy.printoptions(). Accepts the same arguments as set_printoptions().
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import jupyprint, printoptions
+    >>> with printoptions(threshold=10):
+    ...     jupyprint(np.arange(100))
+    >>> with printoptions(significant=3):
+    ...     jupyprint(np.random.normal(size=(3, 3)))
+    """
+    global _print_options_version
+    saved = get_printoptions()
+    try:
+        set_printoptions(**options)
+        yield get_printoptions()
+    finally:
+        _print_options.update(saved)
+        _print_options_version += 1
+
+def stats(reset=False):
+    """Return a snapshot of the profiling stats collected since
+    enable_stats() was called (or the stats were last reset).
+
+    Each call of jupyprint(), jupyprint_many(), to_md(), arraytex() or
+    arrayhtml() (other than calls made by these functions) is timed, split
+    into the stages:
+
+    - "cache": render cache lookup (see RenderCache)
+    - "select": selecting the elements shown in summarized arrays (see
+      set_printoptions())
+    - "convert": converting elements to LaTeX/HTML strings
+    - "join": joining the element strings into rows and the matrix/table
+    - "display": sending the output to the notebook (or batch)
+
+    Parameters
+    ----------
+    reset : {False, True}
+        Whether to reset the stats after taking the snapshot. Default is False.
+
+    Returns
+    -------
+    stats : dict
+        With keys "calls" (number of calls of each function), "stages" (the
+        "count" and "total_s" seconds of each stage), "elements" (number of
+        elements converted), "output_bytes" and "total_s".
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import jupyprint, enable_stats, stats
+    >>> enable_stats()
+    >>> jupyprint(np.random.normal(size=(30, 30)))
+    >>> stats()["stages"]["convert"]
+    """
+    summary = _global_stats.summary()
+    if reset:
+        _global_stats.reset()
+    return summary
+
+def enable_stats(callback=None):
+    """Start collecting profiling stats for every call, see stats(). When
+    stats are not being collected, profiling costs (almost) nothing.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Function called with the profiling record (a dictionary with keys
+        "function", "stages", "elements", "output_bytes" and "total_s") of
+        each call, e.g. to send to your own metrics system.
+    """
+    _global_stats.callback = callback
+    _global_stats.enabled = True
+    _update_profiling()
+
+def disable_stats():
+    """Stop collecting profiling stats (the stats collected so far are kept,
+    use stats(reset=True) to clear them)."""
+    _global_stats.enabled = False
+    _global_stats.callback = None
+    _update_profiling()
+
+@contextmanager
+def collect_stats(callback=None):
+    """Context manager collecting profiling stats for the calls made within
+    the block only. Yields a dictionary which is filled with the stats (in
+    the format of stats()) when the block exits.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        As for enable_stats(), called for each call within the block.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import jupyprint, collect_stats
+    >>> with collect_stats() as block_stats:
+    ...     jupyprint(np.random.normal(size=(30, 30)))
+    >>> block_stats["total_s"]
+    """
+    collector = _Stats(callback=callback)
+    summary = {}
+    _stats_collectors.append(collector)
+    _update_profiling()
+    try:
+        yield summary
+    finally:
+        _stats_collectors.remove(collector)
+        _update_profiling()
+        summary.update(collector.summary())
+
+# ==============================================================================
+# RENDERER
+
+class Renderer:
+    """Renders values as jupyprint(), to_md() and arraytex() do, with a fixed
+    set of options, which are resolved (against the global print options)
+    once when the Renderer is made, rather than on every call. Small arrays
+    are filled into a template for their shape, so a Renderer is the fastest
+    way to print many small values with the same options, e.g. in a loop.
+
+    jupyprint(), to_md() and arraytex() use (cached) Renderers themselves.
+    A Renderer's options are resolved again if the global print options
+    change (see set_printoptions()).
+
+    Parameters
+    ----------
+    quote_strings, strings_in_typefont : {False, True}
+        As for jupyprint(). Default is True.
+    contains_latex : {False, True}
+        As for arraytex(). Default is False.
+    mode : {"auto", "latex", "html"}
+        As for jupyprint(). Default is "auto".
+    threshold, edgeitems : int, optional
+        As for arraytex(). Also used for arrays shown as HTML tables.
+    precision, significant, scientific, suppress_small : optional
+        As for arraytex().
+    processes : int, optional
+        As for arraytex().
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import Renderer
+    >>> renderer = Renderer(precision=2)
+    >>> for i in range(100):
+    ...     renderer.display(np.random.normal(size=(2, 2)))
+    >>> renderer.arraytex(np.eye(2) / 3)
+    '\\begin{bmatrix}{} 0.33 & 0.0 \\\\ 0.0 & 0.33 \\\\ \\end{bmatrix}'
+    """
+
+    __slots__ = ("_options", "_number_options", "_state")
+
+    def __init__(self, quote_strings=True, strings_in_typefont=True,
+                 contains_latex=False, mode="auto", threshold=None,
+                 edgeitems=None, precision=None, significant=None,
+                 scientific=None, suppress_small=None, processes=None):
+        if mode not in ("auto", "latex", "html"):
+            raise ValueError('mode must be one of "auto", "latex" or "html".')
+        self._options = dict(quote_strings=quote_strings,
+                             strings_in_typefont=strings_in_typefont,
+                             contains_latex=contains_latex, mode=mode,
+                             threshold=threshold, edgeitems=edgeitems,
+                             processes=processes)
+        self._number_options = dict(precision=precision,
+                                    significant=significant,
+                                    scientific=scientific,
+                                    suppress_small=suppress_small)
+        self._state = self._resolve()
+
+    @property
+    def options(self):
+        """The options the Renderer was made with, as a dictionary."""
+        return {**self._options, **self._number_options}
+
+    @_profiled
+    def arraytex(self, arr):
+        """Convert a numpy array (or scipy.sparse matrix) to LaTeX, see
+        arraytex().
+
+        Parameters
+        ----------
+        arr: array, shape (n, p), (n,), (1, n) or (..., n, p)
+            A numpy array, or a scipy.sparse matrix.
+
+        Returns
+        -------
+        latex: string
+            A latex string.
+        """
+        (quote_strings, strings_in_typefont, escape, threshold, edgeitems,
+         processes, number_format, template_cells) = self._current()[1:]
+
+        # Small arrays are filled into a template for their shape, converting
+        # all the elements at once (while the render cache is enabled, they
+        # are rendered as below instead)
+        if (type(arr) is np.ndarray and 0 < arr.ndim < 3
+                and 0 < arr.size <= template_cells
+                and not render_cache.enabled):
+            start = _stage_start()
+            if _is_vectorizable(arr.dtype):
+                cells = _vectorized_latex_text(arr,
+                            quote_strings=quote_strings,
+                            strings_in_typefont=strings_in_typefont,
+                            escape=escape,
+                            number_format=number_format).ravel().tolist()
+            else:
+                rows = _latex_cells(arr.reshape(-1, arr.shape[-1])
+                                    if arr.ndim == 2 else arr.reshape(1, -1),
+                                    quote_strings=quote_strings,
+                                    strings_in_typefont=strings_in_typefont,
+                                    escape=escape, number_format=number_format)
+                cells = [cell for row in rows for cell in row]
+            _stage_end("convert", start, elements=arr.size)
+            start = _stage_start()
+            latex = _matrix_template(arr.shape).format(*cells)
+            _stage_end("join", start)
+            return latex
+
+        # Use previously rendered output, if the render cache is enabled and
+        # holds this array
+        start = _stage_start()
+        key = render_cache._key(arr, (quote_strings, strings_in_typefont,
+                                      threshold, edgeitems, escape,
+                                      number_format))
+        if key is not None:
+            latex = render_cache._get(key)
+            if latex is not None:
+                _stage_end("cache", start)
+                return latex
+        _stage_end("cache", start)
+
+        latex = _arraytex(arr, quote_strings=quote_strings,
+                          strings_in_typefont=strings_in_typefont,
+                          threshold=threshold, edgeitems=edgeitems,
+                          escape=escape, number_format=number_format,
+                          processes=processes)
+        if key is not None and latex is not None:
+            render_cache._put(key, latex)
+        return latex
+
+    @_profiled
+    def to_md(self, x, return_raw_string=False):
+        """Build a Markdown object for value `x`, see to_md().
+
+        Parameters
+        ----------
+        x : any input accepted by jupyprint()
+            The input data to be converted to a Markdown object.
+        return_raw_string : {False, True}
+            As for to_md(). Default is False.
+
+        Returns
+        -------
+        IPython.core.display.Markdown object
+        """
+        # If input is a bool, string or number, display  as markdown/LaTeX
+        # (will also work for strings with LaTeX syntax e.g. these will be
+        # printed as LaTeX)
+        if (isinstance(x, (bool, np.bool_, str, np.str_, int, float,
+                           complex))):
+            if return_raw_string == True:
+                print(str(x))
+            return _markdown(str(x))
+
+        # If input is a numpy array (or scipy.sparse matrix) convert to
+        # markdown/LaTeX, then display (checked before dicts, as DOK sparse
+        # matrices are dicts)
+        elif isinstance(x, np.ndarray) or _is_sparse(x):
+            output = self._array_md(x)
+            if return_raw_string == True:
+                print(output)
+            return _markdown(output)
+
+        # If input is a list, tuple or dict, display its (summarized)
+        # structure as LaTeX
+        elif isinstance(x, (list, tuple, dict)):
+            output = f"${self._nested_latex(x)}$"
+            if return_raw_string == True:
+                print(output)
+            return _markdown(output)
+
+        # If the input is a pandas DataFrame, display it nicely rendered (only
+        # the rows and columns shown are formatted)
+        elif _is_dataframe(x):
+            options = self._options
+            output = _dataframe_md(x, quote_strings=options["quote_strings"],
+                        strings_in_typefont=options["strings_in_typefont"],
+                        mode=options["mode"],
+                        contains_latex=options["contains_latex"],
+                        **self._number_options)
+            if return_raw_string == True:
+                print(output)
+            return _markdown(output)
+
+    @_profiled
+    def display(self, x, return_raw_string=False, display_id=None):
+        """Display value `x`, as jupyprint() does.
+
+        Parameters
+        ----------
+        x : any input accepted by jupyprint()
+            The input data to be printed.
+        return_raw_string : {False, True}
+            As for jupyprint(). Default is False.
+        display_id : str, optional
+            As for jupyprint(). Default is None.
+
+        Returns
+        -------
+        None
+        """
+        # Update the output shown with this display_id, see LiveDisplay
+        if display_id is not None:
+            handle = _live_displays.get(display_id)
+            if handle is None:
+                handle = _live_displays[display_id] = \
+                    LiveDisplay(display_id=display_id)
+            handle.quote_strings = self._options["quote_strings"]
+            handle.strings_in_typefont = \
+                self._options["strings_in_typefont"]
+            handle.contains_latex = self._options["contains_latex"]
+            handle.mode = self._options["mode"]
+            for name, value in self._number_options.items():
+                setattr(handle, name, value)
+            handle.update(x)
+            return
+
+        # jupyprint the input (or add it to the active batch, see batch())
+        _display_output(self.to_md(x, return_raw_string=return_raw_string))
+
+    def _resolve(self):
+        # The options, resolved against the global print options, as a tuple
+        # starting with the version of the print options they were resolved
+        # against
+        options = self._options
+        version = _print_options_version
+        quote_strings = options["quote_strings"]
+        strings_in_typefont = options["strings_in_typefont"]
+        escape = True
+        # Override other arguments, if contains_latex == True
+        if options["contains_latex"] == True:
+            quote_strings = False
+            strings_in_typefont = False
+            escape = False
+        threshold = options["threshold"]
+        if threshold is None:
+            threshold = _print_options["threshold"]
+        edgeitems = options["edgeitems"]
+        if edgeitems is None:
+            edgeitems = _print_options["edgeitems"]
+        processes = options["processes"]
+        if processes is None:
+            processes = _print_options["processes"]
+        number_format = _number_format(**self._number_options)
+        return (version, quote_strings, strings_in_typefont, escape,
+                threshold, edgeitems, processes, number_format,
+                min(threshold, _BLOCK_CELLS))
+
+    def _current(self):
+        # The resolved options, resolving them again if the global print
+        # options have changed
+        state = self._state
+        if state[0] != _print_options_version:
+            state = self._state = self._resolve()
+        return state
+
+    def _nested_latex(self, x):
+        # Render a (nested) list, tuple or dict as LaTeX, see _NestedLatex
+        (quote_strings, strings_in_typefont, escape, threshold, edgeitems,
+         _, number_format, _) = self._current()[1:]
+        return _NestedLatex(self, _latex_element_function(
+                                quote_strings == True,
+                                strings_in_typefont == True, escape),
+                            number_format, threshold, edgeitems,
+                            _print_options["max_depth"],
+                            _print_options["max_items"]).render(x)
+
+    def _array_md(self, arr):
+        # Render an array for to_md(), as LaTeX or an HTML table
+        options = self._options
+        mode = options["mode"]
+        threshold, edgeitems = self._current()[4:6]
+        if mode == "auto" and _shown_size(arr, threshold, edgeitems) \
+                > _print_options["latex_max_cells"]:
+            mode = "html"
+        if mode != "html":
+            latex = self.arraytex(arr)
+            if mode == "latex" or \
+                    len(latex) <= _print_options["latex_max_chars"]:
+                return f"${latex}$"
+        return arrayhtml(arr, quote_strings=options["quote_strings"],
+                         strings_in_typefont=options["strings_in_typefont"],
+                         threshold=threshold, edgeitems=edgeitems,
+                         **self._number_options)
+
+class _NestedLatex:
+    # Renders a (nested) list, tuple or dict as LaTeX, for one call of
+    # Renderer.to_md(). Sequences of numbers (of a single type, or rows of
+    # them) are converted to an array and rendered by Renderer.arraytex(),
+    # dicts as key/value tables. The cost is bounded whatever the size of the
+    # containers: only the first and last `max_items` items of a container,
+    # and `max_depth` levels of nesting, are shown, and once about
+    # `threshold` elements have been shown the remaining items are elided.
+    # Containers within themselves are shown as ellipses (as repr() does),
+    # and repeated sub-objects are rendered once.
+
+    def __init__(self, renderer, convert, number_format, threshold,
+                 edgeitems, max_depth, max_items):
+        self.renderer = renderer
+        self.convert = convert
+        self.number_format = number_format
+        self.threshold = threshold
+        self.edgeitems = edgeitems
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.budget = threshold
+        # ids of the containers being rendered (for cycle detection), and
+        # the (LaTeX, number of elements shown) of those rendered, by (id,
+        # depth)
+        self._path = set()
+        self._memo = {}
+        self._n_cycles = 0
+
+    def render(self, x, depth=0):
+        # (sparse matrices first, as DOK sparse matrices are dicts)
+        if isinstance(x, np.ndarray) and x.ndim > 0 or _is_sparse(x):
+            self.budget -= _shown_size(x, self.threshold, self.edgeitems)
+            return self.renderer.arraytex(x)
+        elif isinstance(x, (list, tuple, dict)):
+            return self._container(x, depth)
+        elif _is_dataframe(x):
+            options = self.renderer.options
+            self.budget -= (min(x.shape[0], _print_options["max_rows"])
+                            * min(x.shape[1], _print_options["max_columns"]))
+            return dataframetex(x, **{name: options[name] for name in
+                                      ("quote_strings", "strings_in_typefont",
+                                       "contains_latex", "precision",
+                                       "significant", "scientific",
+                                       "suppress_small")})
+        self.budget -= 1
+        return self._element(x.item() if isinstance(x, np.ndarray) else x)
+
+    def _element(self, el):
+        if isinstance(el, (str, bool, np.bool_)):
+            return self.convert(el)
+        elif isinstance(el, (float, np.floating)):
+            return self._number(el, np.float64, _format_floats)
+        elif isinstance(el, (complex, np.complexfloating)):
+            return self._number(el, np.complex128, _format_complex)
+        elif isinstance(el, (int, np.number)):
+            return str(el)
+        # e.g. None, or other objects, shown as (escaped) text
+        return r"\text{" + _escape_latex(str(el), math_mode=False) + "}"
+
+    def _number(self, el, dtype, formatter):
+        if self.number_format is None:
+            return str(el)
+        return formatter(np.array([el], dtype=dtype), self.number_format)[0]
+
+    def _container(self, x, depth):
+        key = (id(x), depth)
+        if id(x) in self._path:
+            self._n_cycles += 1
+            return _brackets(x, r"\ldots")
+        if key in self._memo:
+            latex, cost = self._memo[key]
+            self.budget -= cost
+            return latex
+        if depth >= self.max_depth:
+            self.budget -= 1
+            return _brackets(x, r"\ldots" if x else "")
+
+        budget, n_cycles = self.budget, self._n_cycles
+        arr = None if isinstance(x, dict) else _numeric_array(x)
+        if arr is not None:
+            latex = self.render(arr, depth)
+        else:
+            self._path.add(id(x))
+            try:
+                latex = self._items(x, depth)
+            finally:
+                self._path.discard(id(x))
+        # (containers with a cycle may be shown differently elsewhere)
+        if self._n_cycles == n_cycles:
+            self._memo[key] = (latex, budget - self.budget)
+        return latex
+
+    def _items(self, x, depth):
+        # The LaTeX of a list, tuple or dict, showing its first and last
+        # items (until the budget runs out)
+        items, n_head = _shown_items(x, self.max_items)
+        is_dict = isinstance(x, dict)
+        # (None marks elided items)
+        shown = []
+        for i, item in enumerate(items):
+            if i == n_head:
+                shown.append(None)
+            if self.budget <= 0:
+                if shown[-1:] != [None]:
+                    shown.append(None)
+                break
+            if is_dict:
+                shown.append((self.render(item[0], depth + 1),
+                              self.render(item[1], depth + 1)))
+            else:
+                shown.append(self.render(item, depth + 1))
+
+        if not is_dict:
+            latex = ", ".join(r"\ldots" if item is None else item
+                              for item in shown)
+            if isinstance(x, tuple) and len(x) == 1:
+                latex += ","
+            return _brackets(x, latex)
+        if not shown:
+            return _brackets(x, "")
+        rows = [r"\vdots & & \vdots" if item is None
+                else item[0] + " & : & " + item[1] for item in shown]
+        return _brackets(x, r"\begin{array}{rcl} " + r" \\ ".join(rows)
+                         + r" \end{array}")
+
+# Renderers used by jupyprint(), to_md() and arraytex(), by their options,
+# see _renderer()
+_renderers = {}
+_MAX_RENDERERS = 64
+
+def _renderer(*options):
+    # The Renderer with these (positional) options, reusing the one made for
+    # earlier calls with the same options. (The types are part of the key,
+    # as e.g. precision=False and precision=0 are equal, but not the same.)
+    key = (options, tuple(map(type, options)))
+    try:
+        return _renderers[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # (unhashable options)
+        return Renderer(*options)
+    renderer = Renderer(*options)
+    if len(_renderers) >= _MAX_RENDERERS:
+        _renderers.clear()
+    _renderers[key] = renderer
+    return renderer
+
+# ==============================================================================
+# RENDER CACHE
+
+class RenderCache:
+    """Least-recently-used cache of the LaTeX rendered by arraytex() (and so
+    also by to_md() and jupyprint()), for numpy arrays.
+
+    Entries are keyed on a hash of the array's contents together with its
+    dtype, shape and the formatting options, so a mutated array will be
+    re-rendered, while an unchanged (or equal) array will not. Object arrays
+    and arrays large enough to be summarized are never cached - hashing these
+    would cost about as much as rendering them.
+
+    The cache is disabled by default, use the `render_cache` instance:
+
+    >>> from jupyprint import render_cache
+    >>> render_cache.enable(maxbytes=32 * 2**20)
+    >>> render_cache.info()
+    >>> render_cache.clear()
+
+    Parameters
+    ----------
+    maxbytes : int
+        Memory budget for the cached LaTeX strings, in bytes. The least
+        recently used entries are evicted to keep within the budget. Default
+        is 64 MiB.
+    """
+
+    def __init__(self, maxbytes=64 * 2**20):
+        self.maxbytes = maxbytes
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def enable(self, maxbytes=None):
+        """Turn the cache on, optionally setting a new memory budget."""
+        if maxbytes is not None:
+            self.maxbytes = maxbytes
+        self.enabled = True
+        with self._lock:
+            self._evict()
+
+    def disable(self):
+        """Turn the cache off and drop all entries."""
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Return a dictionary of cache statistics.
+
+        Returns
+        -------
+        info : dict
+            With keys "enabled", "hits", "misses", "entries", "nbytes" (the
+            memory currently used by cached output) and "maxbytes".
+        """
+        with self._lock:
+            return {"enabled": self.enabled, "hits": self.hits,
+                    "misses": self.misses, "entries": len(self._entries),
+                    "nbytes": self._nbytes, "maxbytes": self.maxbytes}
+
+    def _key(self, arr, options):
+        # Returns None for arrays which should not be cached
+        if (not self.enabled or not isinstance(arr, np.ndarray)
+                or arr.dtype.hasobject or arr.ndim == 0
+                or arr.size > options[2]):
+            return None
+        return (_array_digest(arr), arr.dtype.str, arr.shape, options)
+
+    def _get(self, key):
+        with self._lock:
+            latex = self._entries.get(key)
+            if latex is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return latex
+
+    def _put(self, key, latex):
+        nbytes = sys.getsizeof(latex)
+        if nbytes > self.maxbytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = latex
+            self._nbytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until within budget
+        while self._nbytes > self.maxbytes:
+            _, latex = self._entries.popitem(last=False)
+            self._nbytes -= sys.getsizeof(latex)
+
+render_cache = RenderCache()
+
+# ==============================================================================
+# BATCHED DISPLAY
+
+# Default size (in bytes) at which a batch is displayed, see batch()
+_BATCH_MAX_BYTES = 2**20
+
+# Stack of active batches, see batch()
+_batches = []
+
+class _Batch:
+    # Combined output of jupyprint() calls, displayed as one Markdown output
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.parts = []
+        self.nbytes = 0
+
+    def add(self, output):
+        # to_md() returns None for unsupported inputs
+        if output is None:
+            return
+        text = output.data
+        self.parts.append(text)
+        # (ASCII text, e.g. most LaTeX, has a byte per character - saving
+        # encoding it to count the bytes)
+        self.nbytes += len(text) if text.isascii() \
+            else len(text.encode("utf-8"))
+        if self.nbytes >= self.max_bytes:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            # Separate outputs by blank lines, so each is its own paragraph
+            # (or HTML block)
+            start = _stage_start()
+            display(_markdown("\n\n".join(self.parts)))
+            _stage_end("display", start)
+            self.parts = []
+            self.nbytes = 0
+
+# ==============================================================================
+# LIVE DISPLAY
+
+class LiveDisplay:
+    """Handle for showing a changing value (e.g. inside a loop) in a single,
+    updated-in-place, notebook output.
+
+    Updates are rate limited: frames arriving faster than `max_rate` per
+    second are coalesced, so only the latest pending value is shown once the
+    interval has passed. The final value is always shown - pending frames are
+    flushed by a background timer, and by flush()/close() (or on leaving a
+    `with` block). Values which have not changed since the last frame are not
+    re-rendered.
+
+    Parameters
+    ----------
+    max_rate : float or None
+        Maximum number of display updates per second. None for no limit.
+        Default is 10.
+    display_id : str, optional
+        The IPython display_id of the output. A new, unique, id is used if not
+        given.
+    quote_strings : {False, True}
+        As for jupyprint(). Default is True.
+    strings_in_typefont : {False, True}
+        As for jupyprint(). Default is True.
+    contains_latex : {False, True}
+        As for jupyprint(). Default is False.
+    mode : {"auto", "latex", "html"}
+        As for jupyprint(). Default is "auto".
+    precision, significant, scientific, suppress_small : optional
+        As for jupyprint(). Default to the global print options.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import LiveDisplay
+    >>> weights = np.zeros((3, 3))
+    >>> with LiveDisplay(max_rate=5, precision=2) as live:
+    ...     for i in range(10000):
+    ...         weights += np.random.normal(size=(3, 3))
+    ...         live.update(weights)
+    """
+
+    def __init__(self, max_rate=10, display_id=None, quote_strings=True,
+                 strings_in_typefont=True, contains_latex=False, mode="auto",
+                 precision=None, significant=None, scientific=None,
+                 suppress_small=None):
+        if mode not in ("auto", "latex", "html"):
+            raise ValueError('mode must be one of "auto", "latex" or "html".')
+        _check_digits("precision", precision, 0)
+        _check_digits("significant", significant, 1)
+        self.max_rate = max_rate
+        self.display_id = uuid.uuid4().hex if display_id is None \
+            else display_id
+        self.quote_strings = quote_strings
+        self.strings_in_typefont = strings_in_typefont
+        self.contains_latex = contains_latex
+        self.mode = mode
+        self.precision = precision
+        self.significant = significant
+        self.scientific = scientific
+        self.suppress_small = suppress_small
+        self.frames_shown = 0
+        self.frames_skipped = 0
+        self._shown = False
+        self._last_fingerprint = None
+        self._last_data = None
+        self._last_time = None
+        self._pending = None
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def update(self, x):
+        """Show value `x` (any input accepted by jupyprint()) in the output,
+        subject to rate limiting."""
+        number_format = _number_format(**self._format_options())
+        fingerprint = _fingerprint(x, (self.quote_strings,
+                                       self.strings_in_typefont,
+                                       self.contains_latex, self.mode,
+                                       number_format))
+        with self._lock:
+            if fingerprint is not None and \
+                    fingerprint == self._last_fingerprint:
+                self.frames_skipped += 1
+                return
+            self._last_fingerprint = fingerprint
+
+            wait = self._wait()
+            if wait <= 0:
+                self._show(x)
+                return
+
+            # Too soon after the last frame: replace any pending frame (which
+            # is only rendered when shown), and make sure it is shown once the
+            # interval has passed
+            if self._pending is not None:
+                self.frames_skipped += 1
+            self._pending = x
+            if self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Show the pending frame, if any, straight away."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending is not None:
+                self._show(self._pending)
+
+    def close(self):
+        """Flush the final frame."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _wait(self):
+        # Seconds until the next frame may be shown
+        if not self.max_rate or self._last_time is None:
+            return 0
+        return self._last_time + 1 / self.max_rate - time.monotonic()
+
+    def _show(self, x):
+        self._pending = None
+        output = to_md(x, quote_strings=self.quote_strings,
+                       strings_in_typefont=self.strings_in_typefont,
+                       mode=self.mode, contains_latex=self.contains_latex,
+                       **self._format_options())
+        self._present(output)
+
+    def _format_options(self):
+        # The precision, significant, scientific and suppress_small options
+        return dict(precision=self.precision, significant=self.significant,
+                    scientific=self.scientific,
+                    suppress_small=self.suppress_small)
+
+    def _present(self, output):
+        # Skip updates which would not change the output
+        data = getattr(output, "data", None)
+        if self._shown and data is not None and data == self._last_data:
+            self.frames_skipped += 1
+            return
+        if self._shown:
+            update_display(output, display_id=self.display_id)
+        else:
+            display(output, display_id=self.display_id)
+            self._shown = True
+        self._last_data = data
+        self._last_time = time.monotonic()
+        self.frames_shown += 1
+
+# Handles for jupyprint(..., display_id=...) calls
+_live_displays = {}
+
+# ==============================================================================
+# ASYNC RENDERING
+
+async def to_md_async(x, executor=None, **options):
+    """Awaitable to_md(), building the Markdown in a thread (or process)
+    pool, so the event loop (and e.g. ipywidgets callbacks) keeps running
+    while a large array is rendered.
+
+    Parameters
+    ----------
+    x : any input accepted by jupyprint()
+        The value to be converted.
+    executor : concurrent.futures.Executor, optional
+        Pool to render in. Defaults to a shared pool of (up to 4) threads. A
+        ProcessPoolExecutor renders in parallel with the kernel, but `x` and
+        the output are pickled between processes.
+    **options
+        Other arguments of to_md(), e.g. `quote_strings`.
+
+    Returns
+    -------
+    IPython.core.display.Markdown object
+        As for to_md().
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import to_md_async
+    >>> output = await to_md_async(np.random.normal(size=(50, 50)))
+    """
+    return await _render_async(x, options, executor, threading.Event())
+
+async def ajupyprint(x, quote_strings=True, strings_in_typefont=True,
+                     return_raw_string=False, display_id=None, mode="auto",
+                     contains_latex=False, precision=None, significant=None,
+                     scientific=None, suppress_small=None, executor=None):
+    """Awaitable jupyprint(), rendering `x` in a thread (or process) pool and
+    then displaying it from the event loop.
+
+    Outputs are displayed in the order that ajupyprint() was called (on each
+    event loop), however long each one takes to render. When `display_id` is
+    given, a newer call with the same `display_id` supersedes any call still
+    rendering (or waiting for its turn to be displayed): its render is
+    cancelled (between blocks of rows, when rendering in threads) and its
+    value is not displayed.
+
+    Parameters
+    ----------
+    x : any input accepted by jupyprint()
+        The value to be printed.
+    quote_strings, strings_in_typefont, return_raw_string, mode : optional
+        As for jupyprint().
+    display_id : str, optional
+        If given, the output replaces the previous output with this
+        `display_id` (see jupyprint()), and supersedes pending calls with the
+        same `display_id`. Default is None.
+    contains_latex, precision, significant, scientific, suppress_small :
+        optional
+        As for jupyprint().
+    executor : concurrent.futures.Executor, optional
+        As for to_md_async().
+
+    Returns
+    -------
+    shown : bool
+        False if the value was superseded by a newer call, rather than
+        displayed.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import ajupyprint
+    >>> await ajupyprint(np.random.normal(size=(500, 500)), mode="html")
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    options = dict(quote_strings=quote_strings,
+                   strings_in_typefont=strings_in_typefont,
+                   return_raw_string=return_raw_string, mode=mode,
+                   contains_latex=contains_latex, precision=precision,
+                   significant=significant, scientific=scientific,
+                   suppress_small=suppress_small)
+
+    # Supersede any pending call for the same display_id
+    cancel = threading.Event()
+    if display_id is not None:
+        superseded = _pending_renders.get(display_id)
+        if superseded is not None:
+            superseded.set()
+        _pending_renders[display_id] = cancel
+
+    # Take a place in the display order, after the previous call
+    previous = _display_order.get(loop)
+    done = _display_order[loop] = loop.create_future()
+    try:
+        try:
+            output = await _render_async(x, options, executor, cancel)
+        except _RenderCancelled:
+            output = None
+        if previous is not None:
+            await asyncio.shield(previous)
+        if cancel.is_set():
+            return False
+
+        if display_id is None:
+            _display_output(output)
+        else:
+            handle = _live_displays.get(display_id)
+            if handle is None:
+                handle = _live_displays[display_id] = \
+                    LiveDisplay(display_id=display_id)
+            with handle._lock:
+                handle._last_fingerprint = None
+                handle._present(output)
+        return True
+    finally:
+        if display_id is not None \
+                and _pending_renders.get(display_id) is cancel:
+            del _pending_renders[display_id]
+        if not done.done():
+            done.set_result(None)
+
+# Shared thread pool for async rendering, see _default_executor()
+_executor = None
+_executor_lock = threading.Lock()
+
+# Per event loop, a future which is done once the latest ajupyprint() call
+# has been displayed (or superseded), so outputs are displayed in call order
+_display_order = weakref.WeakKeyDictionary()
+
+# Cancellation events of pending ajupyprint() calls, by display_id
+_pending_renders = {}
+
+# The cancellation event of the render running in this thread, if any
+_render_local = threading.local()
+
+class _RenderCancelled(Exception):
+    # Raised within a render which has been cancelled, see _check_cancelled()
+    pass
+
+def _default_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="jupyprint")
+        return _executor
+
+async def _render_async(x, options, executor, cancel):
+    # Run to_md(x, **options) in `executor`. Renders in threads check the
+    # `cancel` event between blocks of rows (raising _RenderCancelled), which
+    # is set if the awaiting task is cancelled
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    if executor is None:
+        executor = _default_executor()
+    if isinstance(executor, ThreadPoolExecutor):
+        function = functools.partial(_cancellable_to_md, x, options, cancel)
+    else:
+        function = functools.partial(to_md, x, **options)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor,
+                                                                 function)
+    except asyncio.CancelledError:
+        cancel.set()
+        raise
+
+def _cancellable_to_md(x, options, cancel):
+    if cancel.is_set():
+        raise _RenderCancelled
+    _render_local.cancel = cancel
+    try:
+        return to_md(x, **options)
+    finally:
+        _render_local.cancel = None
+
+def _check_cancelled():
+    # Stop a render in a thread when its ajupyprint() call is superseded
+    cancel = getattr(_render_local, "cancel", None)
+    if cancel is not None and cancel.is_set():
+        raise _RenderCancelled
+
+# ==============================================================================
+# HEADLESS EXPORT
+
+def export(xs, file, format=None, **options):
+    """Write values to a Markdown (.md) or LaTeX (.tex) document, without
+    needing IPython or a notebook.
+
+    Values are rendered as by jupyprint(), and arrays are streamed to the file
+    a block of rows at a time, so the whole LaTeX/HTML for a large array is
+    never held in memory. This is a shortcut for writing each value with a
+    DocumentWriter.
+
+    Parameters
+    ----------
+    xs : iterable
+        The values to be written, in order. Each value can be any input
+        accepted by jupyprint().
+    file : str or os.PathLike or file-like
+        Path of the document to write, or an open text file (or other object
+        with a `write` method) to write to.
+    format : {"md", "tex"}, optional
+        Format of the document. Defaults to the suffix of `file` (or "md").
+    **options
+        Other arguments of DocumentWriter, e.g. `quote_strings`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import export
+    >>> export(["The weights:", np.random.normal(size=(500, 500))],
+    ...        "report.md", threshold=np.inf)
+    """
+    with DocumentWriter(file, format=format, **options) as writer:
+        writer.write(*xs)
+
+class DocumentWriter:
+    """Headless writer of jupyprint output to a Markdown (.md) or LaTeX (.tex)
+    document.
+
+    Values are rendered as by jupyprint(), and arrays are streamed to the file
+    a block of rows at a time, so the whole LaTeX/HTML for a large array is
+    never held in memory. In Markdown documents arrays are written as inline
+    LaTeX (or an HTML table, see `mode`), in LaTeX documents as display math;
+    lists, tuples and dicts are written as LaTeX in the same way. Strings are
+    written as they are, separated by blank lines.
+
+    Parameters
+    ----------
+    file : str or os.PathLike or file-like
+        Path of the document to write (which is opened with a write buffer of
+        `buffer_size` bytes, and closed by close()), or an open text file (or
+        other object with a `write` method) to write to.
+    format : {"md", "tex"}, optional
+        Format of the document. Defaults to the suffix of `file` (or "md").
+    quote_strings, strings_in_typefont, contains_latex : {False, True}
+        As for arraytex().
+    threshold, edgeitems : int, optional
+        As for arraytex(). Use `threshold=np.inf` to write every element of
+        large arrays.
+    mode : {"latex", "html"}
+        Whether arrays in Markdown documents are written as LaTeX or HTML
+        tables. Default is "latex".
+    buffer_size : int
+        Size of the write buffer, when `file` is a path. Default is 64 KiB.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from jupyprint import DocumentWriter
+    >>> with DocumentWriter("report.tex") as writer:
+    ...     for i in range(100):
+    ...         writer.write(f"Run {i}:", np.random.normal(size=(3, 3)))
+    """
+
+    def __init__(self, file, format=None, quote_strings=True,
+                 strings_in_typefont=True, contains_latex=False,
+                 threshold=None, edgeitems=None, mode="latex",
+                 buffer_size=2**16):
+        is_path = isinstance(file, (str, os.PathLike))
+        if is_path and format is None:
+            format = os.path.splitext(file)[1].lstrip(".").lower()
+        if format in (None, "", "markdown"):
+            format = "md"
+        if format not in ("md", "tex"):
+            raise ValueError('format must be "md" or "tex".')
+        if mode not in ("latex", "html"):
+            raise ValueError('mode must be "latex" or "html".')
+        # (only opened once the options are known to be valid, so an
+        # existing file is not emptied by a call which then fails)
+        if is_path:
+            self._file = open(file, "w", encoding="utf-8",
+                              buffering=buffer_size)
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        if contains_latex == True:
+            quote_strings = False
+            strings_in_typefont = False
+        self.escape = contains_latex != True
+        self.format = format
+        self.mode = mode
+        self.quote_strings = quote_strings
+        self.strings_in_typefont = strings_in_typefont
+        self.threshold = threshold
+        self.edgeitems = edgeitems
+        self._n_written = 0
+
+    def write(self, *xs):
+        """Append values (any inputs accepted by jupyprint()) to the
+        document."""
+        for x in xs:
+            if self._n_written:
+                self._file.write("\n\n")
+            for chunk in self._chunks(x):
+                self._file.write(chunk)
+            self._n_written += 1
+
+    def close(self):
+        """Finish the document, closing the file if it was opened from a
+        path."""
+        if self._n_written:
+            self._file.write("\n")
+            self._n_written = 0
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _chunks(self, x):
+        # The output for value x, as an iterable of strings
+        if isinstance(x, np.ndarray) or _is_sparse(x):
+            options = dict(quote_strings=self.quote_strings,
+                           strings_in_typefont=self.strings_in_typefont,
+                           threshold=_print_options["threshold"]
+                           if self.threshold is None else self.threshold,
+                           edgeitems=_print_options["edgeitems"]
+                           if self.edgeitems is None else self.edgeitems,
+                           number_format=_number_format())
+            if self.format == "tex":
+                return _wrap_chunks("\\[ ", _iter_arraytex(x,
+                                    escape=self.escape, **options), " \\]")
+            elif self.mode == "html":
+                return _iter_arrayhtml(x, **options)
+            return _wrap_chunks("$", _iter_arraytex(x, escape=self.escape,
+                                                    **options), "$")
+        elif _is_dataframe(x):
+            options = dict(quote_strings=self.quote_strings,
+                           strings_in_typefont=self.strings_in_typefont,
+                           contains_latex=not self.escape)
+            if self.format == "tex":
+                return [dataframetex(x, environment="tabular", **options)]
+            return [_dataframe_md(x, mode=self.mode, **options)]
+        elif isinstance(x, (list, tuple, dict)):
+            latex = Renderer(quote_strings=self.quote_strings,
+                             strings_in_typefont=self.strings_in_typefont,
+                             contains_latex=not self.escape,
+                             threshold=self.threshold,
+                             edgeitems=self.edgeitems)._nested_latex(x)
+            if self.format == "tex":
+                return ["\\[ ", latex, " \\]"]
+            return ["$", latex, "$"]
+        return [str(x)]
+
+# ==============================================================================
+# HIDDEN FUNCTIONS
+
+def _display_output(output):
+    # Display the output of to_md() (or add it to the active batch, see
+    # batch())
+    start = _stage_start()
+    if _batches:
+        _batches[-1].add(output)
+    else:
+        display(output)
+    _stage_end("display", start)
+
+def display(*objs, **kwargs):
+    # IPython's display(), importing IPython on first use
+    from IPython.display import display as ipython_display
+    return ipython_display(*objs, **kwargs)
+
+def update_display(obj, display_id, **kwargs):
+    # IPython's update_display(), importing IPython on first use
+    from IPython.display import update_display as ipython_update_display
+    return ipython_update_display(obj, display_id=display_id, **kwargs)
+
+def _markdown(text):
+    # An IPython Markdown object, importing IPython on first use
+    from IPython.display import Markdown
+    return Markdown(text)
+
+def _is_sparse(x):
+    # scipy is optional - if scipy.sparse has not been imported, x cannot be
+    # a sparse matrix
+    sparse = sys.modules.get("scipy.sparse")
+    return sparse is not None and sparse.issparse(x)
+
+def _n_elements(arr):
+    # Number of elements of an array, or of a sparse matrix (where `size` is
+    # the number of stored elements)
+    return math.prod(arr.shape) if _is_sparse(arr) else arr.size
+
+def _is_dataframe(x):
+    # If pandas has not been imported, x cannot be a DataFrame - so there is
+    # no need to import it
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(x, pd.DataFrame)
+
+def _arraytex(arr, quote_strings=True, strings_in_typefont=True,
+              threshold=1000, edgeitems=3, escape=True, number_format=None,
+              processes=1):
 
     # Determine if the input is a matrix (two dimensions, more than one column),
     # display as a matrix
     if (len(arr.shape) == 2):
         if (arr.shape[1] > 1):
             return _matrix(arr, quote_strings=quote_strings, 
-            strings_in_typefont=strings_in_typefont)
+            strings_in_typefont=strings_in_typefont, threshold=threshold,
+            edgeitems=edgeitems, escape=escape, number_format=number_format,
+            processes=processes)
 
     # If the input is a column vector (1 column), display as a
     # column vector
     if (len(arr.shape) == 2):
         if (arr.shape[1] == 1):
-            return _matrix(arr.reshape(-1, 1), quote_strings=quote_strings, 
-            strings_in_typefont=strings_in_typefont)
+            return _matrix(arr, quote_strings=quote_strings, 
+            strings_in_typefont=strings_in_typefont, threshold=threshold,
+            edgeitems=edgeitems, escape=escape, number_format=number_format,
+            processes=processes)
+
+        # If the input has no columns, display an empty matrix (as for an
+        # empty row vector)
+        elif (arr.shape[1] == 0):
+            return _matrix(arr[:0], quote_strings=quote_strings,
+            strings_in_typefont=strings_in_typefont, threshold=threshold,
+            edgeitems=edgeitems, escape=escape, number_format=number_format,
+            processes=processes)
 
     # If the input is a row vector (1 row), display as a row vector
     elif len(arr.shape) == 1:
         return _matrix(arr.reshape(1, -1), quote_strings=quote_strings,
-        strings_in_typefont=strings_in_typefont,
-                        end_string="")
+        strings_in_typefont=strings_in_typefont, threshold=threshold,
+        edgeitems=edgeitems, escape=escape, number_format=number_format,
+        processes=processes, end_string="")
 
-    # Warn user array is too high-dimensional, if this is the case
-    else:
-        raise ValueError("Array must be 1 or 2 dimensional.")
+    # If the input has more dimensions, display a matrix for each (shown) 2D
+    # slice
+    elif len(arr.shape) > 2:
+        return "".join(_iter_arraytex(arr, quote_strings=quote_strings,
+                           strings_in_typefont=strings_in_typefont,
+                           threshold=threshold, edgeitems=edgeitems,
+                           escape=escape, number_format=number_format))
 
-# ==============================================================================
-# HIDDEN FUNCTIONS
+    # Warn user array has no dimensions, if this is the case
+    else:
+        raise ValueError("Array must have at least one dimension.")
 
 def _matrix(arr, quote_strings=True, strings_in_typefont=True, 
-            end_string=r" \\"):
+            threshold=1000, edgeitems=3, escape=True, number_format=None,
+            processes=1, end_string=r" \\"):
+
+    # Get the start and end of the latex matrix syntax
+    left = "\\begin{{bmatrix}}{{{}}} ".format("")
+    right = " \\end{bmatrix}"
+
+    # Get the LaTeX for each (shown) element of the matrix, a block of rows at
+    # a time, joining each row as we go
+    rows = []
+    cell_function = functools.partial(_latex_cells, escape=escape,
+                        number_format=number_format,
+                        numbers_dtype=_numbers_dtype(arr, number_format,
+                                                     threshold, edgeitems))
+    if (processes > 1 and not _is_sparse(arr)
+            and _print_options["parallel_min_cells"] <= arr.size <= threshold):
+        # Convert and join the rows of large arrays in worker processes
+        start = _stage_start()
+        rows = _parallel_rows(arr, functools.partial(cell_function,
+                                  quote_strings=quote_strings,
+                                  strings_in_typefont=strings_in_typefont),
+                              end_string, processes)
+        _stage_end("convert", start, elements=arr.size)
+    else:
+        for cells in _iter_cell_blocks(arr, cell_function, _LATEX_ELLIPSES,
+                                       quote_strings=quote_strings,
+                                       strings_in_typefont=strings_in_typefont,
+                                       threshold=threshold,
+                                       edgeitems=edgeitems):
+            start = _stage_start()
+            rows.extend([" & ".join(row) + end_string for row in cells])
+            _stage_end("join", start)
+
+    # Join the rows of the matrix to the start/end of the matrix
+    start = _stage_start()
+    latex = left + ' '.join(rows) + right
+    _stage_end("join", start)
+    return latex
+
+@functools.lru_cache(maxsize=128)
+def _matrix_template(shape):
+    # str.format() template of the LaTeX of a (not summarized) 1D/2D array of
+    # this shape, with a field for each element - the template of one row,
+    # repeated for each row
+    if len(shape) == 1:
+        n_rows, n_cols, end_string = 1, shape[0], ""
+    else:
+        (n_rows, n_cols), end_string = shape, r" \\"
+    row = " & ".join(["{}"] * n_cols) + end_string
+    return ("\\begin{{bmatrix}}{{}} " + " ".join([row] * n_rows)
+            + " \\end{{bmatrix}}")
+
+# Horizontal, vertical and diagonal ellipses for summarized arrays
+_LATEX_ELLIPSES = (r"\cdots", r"\vdots", r"\ddots")
+_HTML_ELLIPSES = ("\u22ef", "\u22ee", "\u22f1")
+
+def _summarized_cells(arr, cell_function, ellipses, quote_strings=True,
+                      strings_in_typefont=True, threshold=1000, edgeitems=3):
+    # Convert a 2D array to a list of rows of strings, with `cell_function`.
+    # For large arrays, only the leading and trailing rows/columns are
+    # converted
+    start = _stage_start()
+    row_cut = col_cut = False
+    sparse = _is_sparse(arr)
+    if sparse:
+        # (COO matrices cannot be indexed)
+        arr = arr.tocsr()
+    if _n_elements(arr) > threshold:
+        arr, row_cut, col_cut = _edges(arr, edgeitems)
+    if sparse:
+        arr = arr.toarray()
+    _stage_end("select", start)
+
+    start = _stage_start()
+    cells = cell_function(arr, quote_strings=quote_strings,
+                          strings_in_typefont=strings_in_typefont)
+    _stage_end("convert", start, elements=arr.size)
+
+    # Splice ellipses in where rows/columns have been left out
+    h_ellipsis, v_ellipsis, d_ellipsis = ellipses
+    if col_cut:
+        for row in cells:
+            row.insert(edgeitems, h_ellipsis)
+    if row_cut:
+        if col_cut:
+            ellipsis_row = ([v_ellipsis] * edgeitems + [d_ellipsis]
+                            + [v_ellipsis] * edgeitems)
+        else:
+            ellipsis_row = [v_ellipsis] * arr.shape[1]
+        cells.insert(edgeitems, ellipsis_row)
+    return cells
+
+# Number of elements converted at a time, see _iter_cell_blocks()
+_BLOCK_CELLS = 1024
+
+def _iter_cell_blocks(arr, cell_function, ellipses, quote_strings=True,
+                      strings_in_typefont=True, threshold=1000, edgeitems=3):
+    # Like _summarized_cells(), but yielding the rows in blocks of (about)
+    # _BLOCK_CELLS elements (or a single row, if longer). Each block is
+    # converted from a slice of `arr`, so views and memmaps are never copied
+    # as a whole, and the strings for the whole array are never held at once.
+    # Summarized arrays are small, and converted as one block.
+    if _n_elements(arr) > threshold:
+        yield _summarized_cells(arr, cell_function, ellipses,
+                                quote_strings=quote_strings,
+                                strings_in_typefont=strings_in_typefont,
+                                threshold=threshold, edgeitems=edgeitems)
+        return
+    if _is_sparse(arr):
+        yield from _iter_sparse_cell_blocks(arr, cell_function,
+                    quote_strings=quote_strings,
+                    strings_in_typefont=strings_in_typefont)
+        return
+    for block in _row_blocks(arr):
+        _check_cancelled()
+        start = _stage_start()
+        cells = cell_function(block, quote_strings=quote_strings,
+                              strings_in_typefont=strings_in_typefont)
+        _stage_end("convert", start, elements=block.size)
+        yield cells
+
+def _iter_sparse_cell_blocks(arr, cell_function, quote_strings=True,
+                             strings_in_typefont=True):
+    # _iter_cell_blocks() for scipy.sparse matrices: only the stored elements
+    # of each block of rows are converted, implicit zeros all share the
+    # string of a single converted zero, and no dense array is made
+    csr = arr.tocsr()
+    if not csr.has_canonical_format:
+        # Sum duplicate entries, without changing the user's matrix
+        csr = csr.copy()
+        csr.sum_duplicates()
+    options = dict(quote_strings=quote_strings,
+                   strings_in_typefont=strings_in_typefont)
+    zero = cell_function(np.zeros((1, 1), dtype=csr.dtype), **options)[0][0]
+    n_rows, n_cols = csr.shape
+    block_rows = max(1, _BLOCK_CELLS // max(n_cols, 1))
+    for block_start in range(0, n_rows, block_rows):
+        _check_cancelled()
+        block_end = min(block_start + block_rows, n_rows)
+        first, last = csr.indptr[block_start], csr.indptr[block_end]
+
+        start = _stage_start()
+        values = cell_function(csr.data[first:last].reshape(1, -1),
+                               **options)[0]
+        _stage_end("convert", start, elements=last - first)
+
+        cells = []
+        for i in range(block_start, block_end):
+            row = [zero] * n_cols
+            row_start, row_end = csr.indptr[i], csr.indptr[i + 1]
+            for j, value in zip(csr.indices[row_start:row_end].tolist(),
+                                values[row_start - first:row_end - first]):
+                row[j] = value
+            cells.append(row)
+        yield cells
+
+def _row_blocks(arr):
+    # Views of consecutive blocks of rows of a 2D array, of (about)
+    # _BLOCK_CELLS elements each (or a single row, if longer)
+    block_rows = max(1, _BLOCK_CELLS // max(arr.shape[1], 1))
+    for start in range(0, arr.shape[0], block_rows):
+        yield arr[start:start + block_rows]
+
+def _parallel_rows(arr, cell_function, end_string, processes):
+    # Convert a 2D array to its rows of LaTeX in a pool of worker processes,
+    # a few blocks of rows per worker, keeping the rows in order. Arrays of
+    # fixed-size elements are shared with the workers through shared memory,
+    # rather than pickling the blocks (object arrays hold pointers into this
+    # process, so their blocks have to be pickled)
+    from multiprocessing.shared_memory import SharedMemory
+    n_blocks = min(arr.shape[0], 4 * processes)
+    bounds = np.linspace(0, arr.shape[0], n_blocks + 1).astype(int).tolist()
+    pool = _process_pool(processes)
+    options = [cell_function] * n_blocks, [end_string] * n_blocks
+    if arr.dtype.hasobject:
+        blocks = [arr[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        return [row for rows in pool.map(_convert_rows, blocks, *options)
+                for row in rows]
+
+    shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+    try:
+        shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        for start, stop in zip(bounds, bounds[1:]):
+            shared[start:stop] = arr[start:stop]
+        del shared
+        locations = [(shm.name, arr.dtype, arr.shape, start, stop)
+                     for start, stop in zip(bounds, bounds[1:])]
+        return [row for rows in pool.map(_convert_shared_rows, locations,
+                                         *options)
+                for row in rows]
+    finally:
+        shm.close()
+        shm.unlink()
+
+# Worker process pools for _parallel_rows(), by number of processes
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+def _process_pool(processes):
+    # Workers are started (rather than forked) so they are safe to use from a
+    # process with other threads running, and kept for later calls
+    with _process_pools_lock:
+        pool = _process_pools.get(processes)
+        if pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            pool = _process_pools[processes] = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"))
+        return pool
+
+def _convert_rows(arr, cell_function, end_string):
+    # Worker side of _parallel_rows(), converting a block a row block at a
+    # time, as _matrix() does
+    rows = []
+    for block in _row_blocks(arr):
+        rows.extend([" & ".join(row) + end_string
+                     for row in cell_function(block)])
+    return rows
+
+def _convert_shared_rows(location, cell_function, end_string):
+    # _convert_rows() for rows `start:stop` of an array in shared memory
+    from multiprocessing.shared_memory import SharedMemory
+    name, dtype, shape, start, stop = location
+    shm = SharedMemory(name=name)
+    try:
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        rows = _convert_rows(arr[start:stop], cell_function, end_string)
+        del arr
+        return rows
+    finally:
+        shm.close()
+
+def _iter_arraytex(arr, quote_strings=True, strings_in_typefont=True,
+                   threshold=1000, edgeitems=3, escape=True,
+                   number_format=None, numbers_dtype=None):
+    # Streaming equivalent of arraytex(), yielding strings which join to the
+    # same LaTeX. `numbers_dtype` is that of the whole array, when rendering
+    # one of its slices
+    if numbers_dtype is None:
+        numbers_dtype = _numbers_dtype(arr, number_format, threshold,
+                                       edgeitems)
+    if arr.ndim == 1:
+        arr, end_string = arr.reshape(1, -1), ""
+    elif arr.ndim == 2:
+        # (no rows are shown for an array without columns)
+        arr, end_string = arr[:0] if arr.shape[1] == 0 else arr, r" \\"
+    elif arr.ndim > 2:
+        # One row of an array for each slice shown, its label and matrix
+        slices, slice_threshold = _iter_slices(arr.shape, threshold,
+                                               edgeitems)
+        yield r"\begin{array}{rl} "
+        separator = ""
+        for index in slices:
+            yield separator
+            separator = r" \\ "
+            if index is None:
+                yield r"\vdots &"
+                continue
+            yield r"\text{" + _slice_label(index) + "} & "
+            yield from _iter_arraytex(arr[index], quote_strings=quote_strings,
+                           strings_in_typefont=strings_in_typefont,
+                           threshold=slice_threshold, edgeitems=edgeitems,
+                           escape=escape, number_format=number_format,
+                           numbers_dtype=numbers_dtype)
+        yield r" \end{array}"
+        return
+    else:
+        raise ValueError("Array must have at least one dimension.")
+    yield "\\begin{bmatrix}{} "
+    separator = ""
+    cell_function = functools.partial(_latex_cells, escape=escape,
+                                      number_format=number_format,
+                                      numbers_dtype=numbers_dtype)
+    for cells in _iter_cell_blocks(arr, cell_function, _LATEX_ELLIPSES,
+                                   quote_strings=quote_strings,
+                                   strings_in_typefont=strings_in_typefont,
+                                   threshold=threshold, edgeitems=edgeitems):
+        for row in cells:
+            yield separator + " & ".join(row) + end_string
+            separator = " "
+    yield " \\end{bmatrix}"
+
+def _iter_arrayhtml(arr, quote_strings=True, strings_in_typefont=True,
+                    threshold=1000, edgeitems=3, number_format=None,
+                    caption=None, numbers_dtype=None):
+    # Streaming equivalent of arrayhtml()
+    if numbers_dtype is None:
+        numbers_dtype = _numbers_dtype(arr, number_format, threshold,
+                                       edgeitems)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    elif arr.ndim > 2:
+        # A table for each slice shown, captioned with its label (or, if
+        # there are no slices, an empty table captioned with the shape, so
+        # that the output is not invisible)
+        slices, slice_threshold = _iter_slices(arr.shape, threshold,
+                                               edgeitems)
+        if not math.prod(arr.shape[:-2]):
+            yield ('<table class="jupyprint"><caption>shape '
+                   + str(arr.shape) + "</caption></table>")
+            return
+        for index in slices:
+            if index is None:
+                yield "<div>" + _HTML_ELLIPSES[1] + "</div>"
+                continue
+            yield from _iter_arrayhtml(arr[index], quote_strings=quote_strings,
+                           strings_in_typefont=strings_in_typefont,
+                           threshold=slice_threshold, edgeitems=edgeitems,
+                           number_format=number_format,
+                           caption=_slice_label(index),
+                           numbers_dtype=numbers_dtype)
+        return
+    elif arr.ndim != 2:
+        raise ValueError("Array must have at least one dimension.")
+    yield '<table class="jupyprint">'
+    if caption is not None:
+        yield "<caption>" + caption + "</caption>"
+    cell_function = functools.partial(_html_cells,
+                                      number_format=number_format,
+                                      numbers_dtype=numbers_dtype)
+    for cells in _iter_cell_blocks(arr, cell_function, _HTML_ELLIPSES,
+                                   quote_strings=quote_strings,
+                                   strings_in_typefont=strings_in_typefont,
+                                   threshold=threshold, edgeitems=edgeitems):
+        for row in cells:
+            yield "<tr><td>" + "<td>".join(row)
+    yield "</table>"
+
+def _slice_plan(shape, threshold, edgeitems):
+    # How an array with more than two dimensions is shown, as its 2D slices
+    # along the leading axes. Arrays with more than `threshold` elements are
+    # summarized as numpy does, to the first and last `edgeitems` positions
+    # along every axis, and whole slices in the middle are left out so that
+    # at most (about) `threshold` elements are shown in total. Returns the
+    # positions shown along each leading axis, the numbers of the slices
+    # shown (in C order, out of all combinations of those positions), the
+    # threshold to render each slice with (0 to summarize it), and the total
+    # number of elements shown
+    leading, last = shape[:-2], shape[-2:]
+    if math.prod(shape) > threshold:
+        axes = [range(n) if n <= 2 * edgeitems
+                else [*range(edgeitems), *range(n - edgeitems, n)]
+                for n in leading]
+        slice_threshold = 0
+        slice_cells = math.prod(min(n, 2 * edgeitems) for n in last)
+    else:
+        axes = [range(n) for n in leading]
+        slice_threshold = threshold
+        slice_cells = math.prod(last)
+    n_slices = math.prod(len(positions) for positions in axes)
+    if slice_cells and n_slices * slice_cells > threshold:
+        n_shown = max(1, int(threshold // slice_cells))
+        numbers = itertools.chain(range((n_shown + 1) // 2),
+                                  range(n_slices - n_shown // 2, n_slices))
+    else:
+        n_shown, numbers = n_slices, range(n_slices)
+    return axes, numbers, slice_threshold, n_shown * slice_cells
+
+def _iter_slices(shape, threshold, edgeitems):
+    # The leading indices of the 2D slices shown of an array with more than
+    # two dimensions (see _slice_plan()), with None wherever slices are left
+    # out, and the threshold to render each slice with. Only the indices are
+    # computed - slices are not touched until they are rendered
+    axes, numbers, slice_threshold, _ = _slice_plan(shape, threshold,
+                                                    edgeitems)
+    lengths = [len(positions) for positions in axes]
+
+    def indices():
+        previous = -1
+        for number in numbers:
+            index = tuple(positions[i] for positions, i in
+                          zip(axes, np.unravel_index(number, lengths)))
+            flat = int(np.ravel_multi_index(index, shape[:-2]))
+            if flat != previous + 1:
+                yield None
+            yield index
+            previous = flat
+    return indices(), slice_threshold
+
+def _slice_label(index):
+    # The label of the 2D slice at (leading) index `index`, e.g. "[0, :, :]"
+    return "[" + ", ".join(map(str, index)) + ", :, :]"
+
+def _wrap_chunks(prefix, chunks, suffix):
+    yield prefix
+    yield from chunks
+    yield suffix
 
-    # Get the number of columns
+def _shown_size(arr, threshold, edgeitems):
+    # Number of elements shown for an array, after any summarizing
+    if arr.ndim > 2:
+        return _slice_plan(arr.shape, threshold, edgeitems)[3]
+    if _n_elements(arr) <= threshold:
+        return _n_elements(arr)
+    return int(np.prod([min(n, 2 * edgeitems + 1) for n in arr.shape]))
+
+def _dataframe_md(df, quote_strings=True, strings_in_typefont=True,
+                  mode="auto", contains_latex=False, **number_options):
+    # Render a DataFrame for to_md(), as an HTML table (or LaTeX array)
+    if mode == "latex":
+        return "$" + dataframetex(df, quote_strings=quote_strings,
+                                  strings_in_typefont=strings_in_typefont,
+                                  contains_latex=contains_latex,
+                                  **number_options) + "$"
+    return dataframehtml(df, quote_strings=quote_strings,
+                         strings_in_typefont=strings_in_typefont,
+                         **number_options)
+
+def _dataframe_cells(df, cell_function, ellipses, max_rows=None,
+                     max_columns=None):
+    # The shown cells of a DataFrame, as a list of rows of strings, and the
+    # labels of the shown rows and columns (None where ellipses stand in for
+    # left out rows/columns). Only the rows and columns shown are selected,
+    # and they are converted a column at a time, with `cell_function`
+    start = _stage_start()
+    if max_rows is None:
+        max_rows = _print_options["max_rows"]
+    if max_columns is None:
+        max_columns = _print_options["max_columns"]
+    rows, n_head_rows = _window(df.shape[0], max_rows)
+    columns, n_head_columns = _window(df.shape[1], max_columns)
+    window = df.iloc[rows, columns]
+    _stage_end("select", start)
+
+    start = _stage_start()
+    converted = [cell_function(_column_values(window.iloc[:, j])
+                               .reshape(1, -1))[0]
+                 for j in range(window.shape[1])]
+    cells = [list(row) for row in zip(*converted)] if converted \
+        else [[] for _ in range(window.shape[0])]
+    _stage_end("convert", start, elements=window.size)
+
+    row_labels = [str(label) for label in window.index]
+    column_labels = [str(label) for label in window.columns]
+    h_ellipsis, v_ellipsis, d_ellipsis = ellipses
+    if n_head_columns is not None:
+        for row in cells:
+            row.insert(n_head_columns, h_ellipsis)
+        column_labels.insert(n_head_columns, None)
+    if n_head_rows is not None:
+        ellipsis_row = [v_ellipsis] * len(column_labels)
+        if n_head_columns is not None:
+            ellipsis_row[n_head_columns] = d_ellipsis
+        cells.insert(n_head_rows, ellipsis_row)
+        row_labels.insert(n_head_rows, None)
+    return cells, row_labels, column_labels
+
+def _window(n, max_n):
+    # Positions of the first and last items shown, out of n, and the number
+    # shown before the ellipsis (None if all n are shown)
+    if n <= max_n:
+        return np.arange(n), None
+    n_head = (max_n + 1) // 2
+    return np.r_[0:n_head, n - max_n // 2:n], n_head
+
+def _column_values(column):
+    # The values of a DataFrame column, as a numpy array. Datetimes are shown
+    # as pandas shows them, and missing values of extension dtypes (e.g.
+    # nullable integers) as nan
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "Mm":
+            return column.to_numpy(dtype=object)
+        return column.to_numpy()
+    values = column.to_numpy()
+    if values.dtype.hasobject and column.hasnans:
+        values = column.to_numpy(dtype=object, na_value=np.nan)
+    return values
+
+def _numeric_array(x):
+    # A list or tuple as a numpy array, if it is a sequence of numbers of a
+    # single type (so converting it loses nothing), or of equal-length
+    # sequences of them, else None. The type of the first element is checked
+    # first, and the others only against it, so e.g. a long list of strings
+    # is turned down without looking at the rest of it
+    if not x:
+        return None
+    kind = type(x[0])
+    if kind in (list, tuple):
+        n_cols = len(x[0])
+        if not n_cols or not _is_number_type(type(x[0][0])):
+            return None
+        element_kind = type(x[0][0])
+        for row in x:
+            if (type(row) is not kind or len(row) != n_cols
+                    or any(type(el) is not element_kind for el in row)):
+                return None
+    elif (not _is_number_type(kind)
+            or any(type(el) is not kind for el in x)):
+        return None
+    try:
+        arr = np.array(x)
+    except (ValueError, OverflowError):
+        return None
+    # (e.g. integers too large for int64)
+    return None if arr.dtype.hasobject else arr
+
+def _is_number_type(kind):
+    # Whether elements of type `kind` are shown as numbers in an array
+    return issubclass(kind, (int, float, complex, np.number, np.bool_))
+
+def _shown_items(x, max_items):
+    # The first and last items of a list or tuple (the (key, value) items of
+    # a dict) shown, out of `max_items`, and the number shown before the
+    # ellipsis (None if all are shown). Only the items shown are visited.
+    n = len(x)
+    if n <= max_items:
+        return list(x.items() if isinstance(x, dict) else x), None
+    n_head, n_tail = (max_items + 1) // 2, max_items // 2
+    if isinstance(x, dict):
+        head = list(itertools.islice(x.items(), n_head))
+        tail = list(itertools.islice(reversed(x.items()), n_tail))[::-1]
+        return head + tail, n_head
+    return list(x[:n_head]) + list(x[n - n_tail:]), n_head
+
+def _brackets(x, latex):
+    # Put the LaTeX of the items of a list, tuple or dict in brackets
+    latex = " " + latex + " " if latex else " "
+    if isinstance(x, dict):
+        return r"\left\{" + latex + r"\right\}"
+    elif isinstance(x, tuple):
+        return r"\left(" + latex + r"\right)"
+    return r"\left[" + latex + r"\right]"
+
+def _edges(arr, edgeitems):
+    # Select the first and last `edgeitems` rows and columns of a 2D array,
+    # only copying the selected elements. Also returns whether rows and/or
+    # columns were left out.
+    n_rows, n_cols = arr.shape
+    row_cut = n_rows > 2 * edgeitems
+    col_cut = n_cols > 2 * edgeitems
+    rows = np.r_[:edgeitems, n_rows - edgeitems:n_rows] if row_cut \
+        else np.arange(n_rows)
+    cols = np.r_[:edgeitems, n_cols - edgeitems:n_cols] if col_cut \
+        else np.arange(n_cols)
+    return arr[np.ix_(rows, cols)], row_cut, col_cut
+
+def _latex_cells(arr, quote_strings=True, strings_in_typefont=True,
+                 escape=True, number_format=None, numbers_dtype=None):
+    # Convert a 2D array to a list of rows, each a list of LaTeX strings.
+    # Numeric, bool and unicode arrays are converted with whole-array numpy
+    # string operations, only object (and other exotic) arrays need to be
+    # converted element-by-element
+    if isinstance(arr, np.ma.MaskedArray):
+        return _fill_masked(arr, _latex_cells(arr.data,
+                    quote_strings=quote_strings,
+                    strings_in_typefont=strings_in_typefont, escape=escape,
+                    number_format=number_format, numbers_dtype=numbers_dtype))
+    if _is_vectorizable(arr.dtype):
+        return _vectorized_latex_text(arr, quote_strings=quote_strings,
+                    strings_in_typefont=strings_in_typefont,
+                    escape=escape, number_format=number_format).tolist()
+
+    elements = arr.flatten()
+    convert = _latex_element_function(quote_strings == True,
+                                      strings_in_typefont == True,
+                                      escape == True)
+    converted = [convert(el) for el in elements]
+    _format_object_numbers(elements, converted, number_format)
+    return _format_rows(arr, converted, numbers_dtype, number_format)
+
+def _format_rows(arr, converted, numbers_dtype=None, number_format=None):
+    # The converted elements of 2D object array `arr` (a flat list) as a list
+    # of rows of strings. When all the elements of the whole array are
+    # numbers, they are shown as numpy shows them in an array of their common
+    # dtype (e.g. ints as floats, if there are any floats) - `numbers_dtype`
+    # is that dtype, worked out once for the whole array (see
+    # _numbers_dtype()), so every block of rows is shown the same way. None
+    # to work it out from `arr` itself
+    if numbers_dtype is None:
+        numbers_dtype = _numbers_dtype(arr, number_format)
+    if numbers_dtype != object:
+        converted = [numbers_dtype.type(el) for el in converted]
     n_cols = arr.shape[1]
+    return [[format(el) for el in converted[start:start + n_cols]]
+            for start in range(0, len(converted), n_cols)] if n_cols \
+        else [[] for _ in range(arr.shape[0])]
 
-    # Original shape of array
-    original_shape = arr.shape
+def _numbers_dtype(arr, number_format=None, threshold=None, edgeitems=3):
+    # The dtype numpy gives an array of the converted elements of object
+    # array `arr` (see _latex_cells()), if these are all numbers - otherwise
+    # (e.g. if there are strings, which numbers are shown alongside as they
+    # are) the object dtype. Only the types of the elements shown (with
+    # `threshold` and `edgeitems`, None to look at every element) are looked
+    # at, so the dtype can be worked out for a whole array, whose elements
+    # are then converted a block at a time
+    if not isinstance(arr, np.ndarray) or not arr.dtype.hasobject:
+        return np.dtype(object)
+    examples = {}
+    for el in _shown_elements(arr, threshold, edgeitems):
+        kind = type(el)
+        # (ints too large for int64 would overflow, numpy keeps these as
+        # objects)
+        if isinstance(el, int) and not -2**63 <= el < 2**63:
+            return np.dtype(object)
+        if kind in examples:
+            continue
+        if (not issubclass(kind, (int, float, complex, np.number))
+                or issubclass(kind, bool)):
+            return np.dtype(object)
+        # (formatted floats are strings)
+        if number_format is not None and issubclass(kind, (float, complex,
+                np.floating, np.complexfloating)):
+            return np.dtype(object)
+        examples[kind] = el
+    if not examples:
+        return np.dtype(object)
+    return np.array(list(examples.values())).dtype
 
-    # Flattened array 
-    flattened_array = arr.flatten()
+def _shown_elements(arr, threshold=None, edgeitems=3):
+    # Iterate over the elements of `arr` shown with `threshold` and
+    # `edgeitems` (every element, if `threshold` is None): the edges of a
+    # summarized matrix, or of each 2D slice shown. Elements are visited with
+    # `flat`, so strided views are not copied
+    if arr.ndim < 2:
+        arr = arr.reshape(1, -1)
+    if threshold is None or arr.ndim == 2 and arr.size <= threshold:
+        yield from arr.flat
+    elif arr.ndim == 2:
+        yield from _edges(arr, edgeitems)[0].flat
+    else:
+        slices, slice_threshold = _iter_slices(arr.shape, threshold,
+                                               edgeitems)
+        for index in slices:
+            if index is not None:
+                yield from _shown_elements(arr[index], slice_threshold,
+                                           edgeitems)
 
-    # For elements of the matrix which are strings or bools, make sure the
-    # elements are shown as text in latex
-    flattened_array = np.array([_needs_latex_text(el, \
-                        quote_strings=quote_strings,
-                        strings_in_typefont=strings_in_typefont) \
-                        for el in flattened_array])
-    
-    # Reshape to shape of original array
-    arr = flattened_array.reshape(original_shape)
+def _fingerprint(x, options):
+    # A cheap identifier of the rendered output of jupyprint(x), for values
+    # where one can be found without rendering, otherwise None
+    if isinstance(x, (bool, np.bool_, str, int, float, complex)):
+        return (type(x), x, options)
+    if (isinstance(x, np.ndarray) and not x.dtype.hasobject
+            and x.size <= _print_options["threshold"]):
+        return (_array_digest(x), x.dtype.str, x.shape, options)
+    return None
 
-    # Get the start and end of the latex matrix syntax
-    left = "\\begin{{bmatrix}}{{{}}} ".format("")
-    right = " \\end{bmatrix}"
+def _html_cells(arr, quote_strings=True, strings_in_typefont=True,
+                number_format=None, numbers_dtype=None):
+    # HTML counterpart of _latex_cells()
+    if isinstance(arr, np.ma.MaskedArray):
+        return _fill_masked(arr, _html_cells(arr.data,
+                    quote_strings=quote_strings,
+                    strings_in_typefont=strings_in_typefont,
+                    number_format=number_format, numbers_dtype=numbers_dtype))
+    if _is_vectorizable(arr.dtype):
+        return _vectorized_html_text(arr, quote_strings=quote_strings,
+                    strings_in_typefont=strings_in_typefont,
+                    number_format=number_format).tolist()
 
-    # Get the rows of the matrix and join them to the start/end of the matrix
-    rows = [_row_f_string(n_cols, end_string=end_string).format(*row)
-            for row in arr]
-    return left + ' '.join(rows) + right
+    elements = arr.flatten()
+    convert = _html_element_function(quote_strings == True,
+                                     strings_in_typefont == True)
+    converted = [convert(el) for el in elements]
+    _format_object_numbers(elements, converted, number_format)
+    return _format_rows(arr, converted, numbers_dtype, number_format)
 
-def _needs_latex_text(el, quote_strings=True, strings_in_typefont=True):
-    # Add LaTex `\text{}` around elements of array, if the element is a 
-    # string or a bool
-    if isinstance(el, (bool, np.bool_)):
-        return r'\text{' + str(el) + r'}'
-    
-    elif isinstance(el, (str, np.str_)) and (quote_strings == True) \
-        and (strings_in_typefont == True):
-        return r"{\tt'" + str(el).replace(" ", "~~") + r"'}"
-    
-    elif isinstance(el, (str, np.str_)) and (quote_strings == False) \
-        and (strings_in_typefont == True):
-        return r'{\tt ' + str(el).replace(" ", "~~") + r'}'
-    
-    elif isinstance(el, (str, np.str_)) and (quote_strings == True) \
-        and (strings_in_typefont == False):
-        return r"\text{''" + str(el) + r"''}"
-    
-    elif isinstance(el, (str, np.str_)) and (quote_strings == False) \
-        and (strings_in_typefont == False):
-        return r'\text{' + str(el) + r'}'
-    
+def _fill_masked(arr, cells):
+    # Show the masked elements of 2D masked array `arr`, whose data has been
+    # converted to the rows of strings `cells`, as nan (as numpy converts
+    # them to)
+    rows, cols = np.nonzero(np.ma.getmaskarray(arr))
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        cells[i][j] = "nan"
+    return cells
+
+def _array_digest(arr):
+    # Hash of the contents of a (non-object) array. Non-contiguous arrays
+    # (e.g. strided views) are hashed a block of rows at a time, rather than
+    # being copied as a whole
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(arr, np.ma.MaskedArray):
+        # (masked elements are shown as nan, whatever their data)
+        digest.update(_array_digest(np.ma.getmaskarray(arr)))
+        arr = arr.data
+    if arr.flags.c_contiguous:
+        digest.update(arr.data)
+    else:
+        rows = arr.reshape(1, -1) if arr.ndim < 2 \
+            else arr.reshape(arr.shape[0], -1)
+        for block in _row_blocks(rows):
+            digest.update(np.ascontiguousarray(block).data)
+    return digest.digest()
+
+def _is_vectorizable(dtype):
+    # Long double floats/complexes are excluded, as str.format() renders them
+    # via a (lossy) python float, which numpy's own string casting does not
+    kind = dtype.kind
+    return (kind in "biuU" or (kind == "f" and dtype.itemsize <= 8)
+            or (kind == "c" and dtype.itemsize <= 16))
+
+def _vectorized_latex_text(arr, quote_strings=True, strings_in_typefont=True,
+                           escape=True, number_format=None):
+    # Whole-array equivalent of converting every element with
+    # _latex_element_function() and then formatting the result with
+    # str.format()
+    kind = arr.dtype.kind
+    if kind == "b":
+        return np.where(arr, r'\text{True}', r'\text{False}')
+    elif kind in "iu":
+        return arr.astype(str)
+    # str.format() shows float16/float32 (and complex64) elements at float64
+    # precision, so cast up before converting to strings
+    elif kind == "f":
+        return _format_floats(arr.astype(np.float64, copy=False),
+                              number_format)
+    elif kind == "c":
+        return _format_complex(arr.astype(np.complex128, copy=False),
+                               number_format)
+
+    # Unicode strings
+    if escape:
+        arr = _vectorized_escape_latex(arr,
+                                       math_mode=strings_in_typefont == True)
+    if strings_in_typefont == True:
+        arr = _char_replace(arr, " ", "~~")
+    prefix, suffix = _STRING_WRAPPERS[(quote_strings == True,
+                                       strings_in_typefont == True)]
+    return np.char.add(np.char.add(prefix, arr), suffix)
+
+# The LaTeX placed either side of a string element, keyed on
+# (quote_strings, strings_in_typefont) - see _latex_element_function()
+_STRING_WRAPPERS = {
+    (True, True): (r"{\tt'", r"'}"),
+    (False, True): (r'{\tt ', r'}'),
+    (True, False): (r"\text{''", r"''}"),
+    (False, False): (r'\text{', r'}'),
+}
+
+# Stands in for backslashes while escaping LaTeX, so the backslashes added by
+# the other escapes are not themselves escaped (a private use character)
+_BACKSLASH = "\ue000"
+
+# Escapes for LaTeX special characters in strings, in math mode (for strings
+# in typewriter font, which are within `{\tt ...}` in the matrix) and in text
+# mode (within `\text{...}`). Backslashes must come first and last.
+_LATEX_ESCAPES = {
+    True: (("\\", _BACKSLASH), ("{", r"\{"), ("}", r"\}"), ("_", r"\_"),
+           ("%", r"\%"), ("&", r"\&"), ("#", r"\#"), ("$", r"\$"),
+           ("^", r"\hat{}"), ("~", r"\sim{}"), (_BACKSLASH, r"\backslash{}")),
+    False: (("\\", _BACKSLASH), ("{", r"\{"), ("}", r"\}"), ("_", r"\_"),
+            ("%", r"\%"), ("&", r"\&"), ("#", r"\#"), ("$", r"\$"),
+            ("^", r"\textasciicircum{}"), ("~", r"\textasciitilde{}"),
+            (_BACKSLASH, r"\textbackslash{}")),
+}
+
+# Lookup table of the (ASCII) LaTeX special characters, by code point
+_IS_LATEX_SPECIAL = np.zeros(128, dtype=bool)
+_IS_LATEX_SPECIAL[[ord(char) for char in "\\{}_%&#$^~"]] = True
+
+def _vectorized_escape_latex(arr, math_mode=True):
+    # Escape LaTeX special characters in a unicode array. Only the characters
+    # present are replaced (each replacement is a pass over the array), found
+    # from the array's code points
+    codes = np.ascontiguousarray(arr).view(np.uint32)
+    present = set(np.unique(codes[_IS_LATEX_SPECIAL[np.minimum(codes, 127)]])
+                  .tolist())
+    if not present:
+        return arr
+    for char, escaped in _LATEX_ESCAPES[math_mode]:
+        if ord("\\" if char == _BACKSLASH else char) in present:
+            arr = _char_replace(arr, char, escaped)
+    return arr
+
+def _char_replace(arr, old, new):
+    # np.char.replace() on a unicode array. Some numpy 2 versions size the
+    # result wrongly (truncating it) for python str arguments, but not for
+    # numpy strings
+    return np.char.replace(arr, np.str_(old), np.str_(new))
+
+def _escape_latex(text, math_mode=True):
+    # Escape LaTeX special characters in a string
+    return text.translate(_LATEX_TRANSLATIONS[math_mode])
+
+# _LATEX_ESCAPES as str.translate() tables, which escape in a single pass (so
+# need no stand-in for backslashes)
+_LATEX_TRANSLATIONS = {
+    math_mode: str.maketrans({"\\" if char == _BACKSLASH else char: escaped
+                              for char, escaped in escapes[1:]})
+    for math_mode, escapes in _LATEX_ESCAPES.items()
+}
+
+def _number_format(precision=None, significant=None, scientific=None,
+                   suppress_small=None):
+    # Resolve number formatting options against the global print options, as
+    # a (hashable) tuple of (precision, significant, scientific,
+    # suppress_small). None for Python's default formatting of floats
+    if precision is None:
+        precision = _print_options["precision"]
+    if significant is None:
+        significant = _print_options["significant"]
+    if scientific is None:
+        scientific = _print_options["scientific"]
+    if suppress_small is None:
+        suppress_small = _print_options["suppress_small"]
+    _check_digits("precision", precision, 0)
+    _check_digits("significant", significant, 1)
+    precision = None if precision is False else precision
+    significant = None if significant is False else significant
+    if significant is not None:
+        precision = None
+    if (precision is None and significant is None and scientific != True
+            and suppress_small != True):
+        return None
+    return (precision, significant, scientific == True, suppress_small == True)
+
+def _check_digits(name, value, minimum):
+    # Validate the precision/significant options (None/False for unset)
+    if value is None or value is False:
+        return
+    # (bools are ints, but precision=True is a mistake rather than 1)
+    if (not isinstance(value, (int, np.integer))
+            or isinstance(value, bool) or value < minimum):
+        raise ValueError(f"{name} must be an integer of at least {minimum}, "
+                         "or False.")
+
+def _format_floats(arr, number_format):
+    # Vectorized formatting of a float64 array as strings, by rounding and
+    # then converting with numpy (which gives the shortest string that
+    # round-trips, as str() does) - so rounded elements have no trailing
+    # zeros, or floating point noise
+    if number_format is None:
+        return arr.astype(str)
+    precision, significant, scientific, suppress_small = number_format
+    if suppress_small:
+        tiny = 10.0 ** -(8 if precision is None else precision)
+        arr = np.where(np.abs(arr) < tiny, 0.0, arr)
+    if scientific:
+        if significant is not None:
+            precision = significant - 1
+        return _format_scientific(arr, 8 if precision is None else precision)
+    if significant is not None:
+        arr = _round_significant(arr, significant)
+    elif precision is not None:
+        arr = _round_decimals(arr, precision)
+    # (adding zero turns -0.0, from rounding small negative numbers, into 0.0)
+    return (arr + 0.0).astype(str)
+
+def _exponents(arr):
+    # Decimal exponent of each element of a float array (0 for zero, inf and
+    # nan)
+    finite = np.isfinite(arr) & (arr != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(finite, np.floor(np.log10(np.abs(arr))), 0)
+
+def _round_significant(arr, significant):
+    # Round each element of a float array to a number of significant digits.
+    # Scaling by dividing by powers of ten, rather than multiplying by their
+    # reciprocals, keeps the results free of floating point noise - but only
+    # powers up to 10^22 are exact, so the (rare) elements needing larger
+    # powers are rounded one by one
+    decimals = significant - 1 - _exponents(arr)
+    scale = 10.0 ** np.minimum(np.abs(decimals), 22)
+    with np.errstate(over="ignore", invalid="ignore"):
+        rounded = np.where(decimals >= 0, np.round(arr * scale) / scale,
+                           np.round(arr / scale) * scale)
+    rounded = np.where(np.isfinite(arr), rounded, arr)
+    for i in np.flatnonzero(np.abs(decimals) > 22):
+        value = float(f"{arr.flat[i]:.{significant}g}")
+        # (rounding the largest floats up can overflow)
+        rounded.flat[i] = value if np.isfinite(value) else arr.flat[i]
+    return rounded
+
+def _round_decimals(arr, precision):
+    # Round each element of a float array to `precision` decimal places. Only
+    # elements with (any of their at most 17 significant) digits after that
+    # are rounded - for the others rounding changes nothing, but scaling by
+    # 10^precision, as np.round() does, can overflow. As for
+    # _round_significant(), scaling is only exact up to 10^22, so elements
+    # needing larger powers are rounded one by one
+    rounding = _exponents(arr) + precision < 16
+    if precision <= 22:
+        # (the elements not rounded can overflow)
+        with np.errstate(over="ignore", invalid="ignore"):
+            return np.where(rounding, np.round(arr, precision), arr)
+    rounded = arr.copy()
+    for i in np.flatnonzero(rounding):
+        rounded.flat[i] = float(f"{arr.flat[i]:.{precision}f}")
+    return rounded
+
+def _format_scientific(arr, decimals):
+    # Format a float array in scientific notation, like "%.{decimals}e" but
+    # without trailing zeros (e.g. 1.5e-07, 2e+03)
+    exponents = _exponents(arr)
+    # (scaling in two steps, as 10^324, needed for subnormal numbers,
+    # overflows)
+    scale = 10.0 ** np.minimum(np.abs(exponents), 300)
+    rest = 10.0 ** np.maximum(np.abs(exponents) - 300, 0)
+    with np.errstate(over="ignore", invalid="ignore"):
+        mantissas = np.where(exponents >= 0, arr / scale / rest,
+                             arr * scale * rest)
+    # (mantissas have at most 17 significant digits, and rounding to more
+    # decimals, scaling by 10^decimals, can overflow)
+    mantissas = np.round(mantissas, min(decimals, 17))
+    # Rounding can carry into the next power of ten (9.99 -> 10.0)
+    carried = np.abs(mantissas) >= 10
+    mantissas = np.where(carried, mantissas / 10, mantissas) + 0.0
+    exponents = (exponents + carried).astype(np.int64)
+    finite = np.isfinite(arr)
+    mantissas = np.where(finite, mantissas, 0.0)
+    whole = mantissas == np.trunc(mantissas)
+    mantissa_text = np.where(whole, mantissas.astype(np.int64).astype(str),
+                             mantissas.astype(str))
+    exponent_text = np.char.zfill(np.abs(exponents).astype(str), 2)
+    text = np.char.add(np.char.add(mantissa_text,
+                                   np.where(exponents < 0, "e-", "e+")),
+                       exponent_text)
+    return np.where(finite, text, arr.astype(str))
+
+def _format_complex(arr, number_format):
+    # Vectorized formatting of a complex128 array, as str() does ("(1+2j)"),
+    # with the real and imaginary parts formatted as floats
+    if number_format is None:
+        return arr.astype(str)
+    real = _format_floats(arr.real, number_format)
+    imag = _format_floats(arr.imag, number_format)
+    imag = np.where(np.char.startswith(imag, "-"), imag,
+                    np.char.add("+", imag))
+    return np.char.add(np.char.add(np.char.add("(", real), imag), "j)")
+
+def _format_object_numbers(elements, converted, number_format):
+    # Replace the converted float (and complex) elements of an object array,
+    # in list `converted`, with their formatted strings, formatting them
+    # together
+    if number_format is None:
+        return
+    for types, dtype, formatter in [
+            ((float, np.floating), np.float64, _format_floats),
+            ((complex, np.complexfloating), np.complex128, _format_complex)]:
+        indices = [i for i, el in enumerate(elements)
+                   if isinstance(el, types)]
+        if indices:
+            values = np.array([elements[i] for i in indices], dtype=dtype)
+            for i, text in zip(indices,
+                               formatter(values, number_format).tolist()):
+                converted[i] = text
+
+def _vectorized_html_text(arr, quote_strings=True, strings_in_typefont=True,
+                          number_format=None):
+    # Whole-array equivalent of converting every element with
+    # _html_element_function().
+    # Numbers are shown the same as in LaTeX
+    kind = arr.dtype.kind
+    if kind == "b":
+        return np.where(arr, "True", "False")
+    elif kind != "U":
+        return _vectorized_latex_text(arr, number_format=number_format)
+
+    for char, escaped in _HTML_ESCAPES:
+        arr = _char_replace(arr, char, escaped)
+    prefix, suffix = _HTML_STRING_WRAPPERS[(quote_strings == True,
+                                            strings_in_typefont == True)]
+    return np.char.add(np.char.add(prefix, arr), suffix)
+
+# HTML escapes for string elements ("&" must come first). "$" is escaped so
+# MathJax leaves the table alone, and newlines so they do not end the HTML
+# block within the Markdown
+_HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"),
+                 ("$", "&#36;"), ("\n", "<br>"))
+
+# The HTML placed either side of a string element, keyed on
+# (quote_strings, strings_in_typefont)
+_HTML_STRING_WRAPPERS = {
+    (True, True): ("<code>'", "'</code>"),
+    (False, True): ("<code>", "</code>"),
+    (True, False): ('"', '"'),
+    (False, False): ("", ""),
+}
+
+@functools.lru_cache(maxsize=None)
+def _html_element_function(quote_strings=True, strings_in_typefont=True):
+    # HTML counterpart of _latex_element_function()
+    prefix, suffix = _HTML_STRING_WRAPPERS[(quote_strings, strings_in_typefont)]
+
+    def convert(el):
+        if isinstance(el, str):
+            return prefix + el.translate(_HTML_TRANSLATION) + suffix
+        elif isinstance(el, (bool, np.bool_)):
+            return str(el)
+        elif isinstance(el, (int, float, complex, np.number)):
+            return el
+        else:
+            # e.g. None, or other objects whose str() may contain "<" etc.
+            return str(el).translate(_HTML_TRANSLATION)
+    return convert
+
+def _escape_html(text):
+    return text.translate(_HTML_TRANSLATION)
+
+# _HTML_ESCAPES as a str.translate() table (which escapes in a single pass,
+# so the order of the escapes does not matter)
+_HTML_TRANSLATION = str.maketrans(dict(_HTML_ESCAPES))
+
+@functools.lru_cache(maxsize=None)
+def _latex_element_function(quote_strings=True, strings_in_typefont=True,
+                            escape=True):
+    # A function converting an element of an object array to LaTeX, made once
+    # for each combination of options, so each element is only checked for
+    # its type: strings are escaped (if `escape`) and wrapped in typewriter
+    # font or `\text{}`, bools are wrapped in `\text{}`, and other elements
+    # are returned as they are
+    prefix, suffix = _STRING_WRAPPERS[(quote_strings, strings_in_typefont)]
+    translation = _LATEX_TRANSLATIONS[strings_in_typefont] if escape else {}
+    if strings_in_typefont:
+        def convert_string(el):
+            return prefix + el.translate(translation).replace(" ", "~~") \
+                + suffix
     else:
-        return el
+        def convert_string(el):
+            return prefix + el.translate(translation) + suffix
 
-def _row_f_string(n_cols, end_string=r" \\"):
-    return " & ".join(["{}"]*n_cols) + end_string
+    def convert(el):
+        if isinstance(el, str):
+            return convert_string(el)
+        elif isinstance(el, (bool, np.bool_)):
+            return r'\text{' + str(el) + r'}'
+        else:
+            return el
+    return convert
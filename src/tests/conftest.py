@@ -0,0 +1,26 @@
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import jupyprint
+
+@pytest.fixture
+def module():
+    "The module jupyprint is defined in (rather than the package)."
+    return sys.modules[jupyprint.__module__]
+
+@pytest.fixture
+def displays(monkeypatch, module):
+    """Replace IPython's display() and update_display() with functions
+    recording (function name, data, display_id) for each output."""
+    calls = []
+    monkeypatch.setattr(module, "display", lambda obj, display_id=None:
+                        calls.append(("display", obj.data, display_id)))
+    monkeypatch.setattr(module, "update_display", lambda obj, display_id:
+                        calls.append(("update", obj.data, display_id)))
+    return calls
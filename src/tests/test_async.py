@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import numpy as np
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import to_md, arraytex, ajupyprint, to_md_async
+
+class FakeMarkdown:
+    def __init__(self, data):
+        self.data = data
+
+@pytest.fixture
+def slow_to_md(monkeypatch, module):
+    "Replace to_md() with one taking `x` seconds to render number x."
+    def fake_to_md(x, **options):
+        time.sleep(x)
+        return FakeMarkdown(str(x))
+    monkeypatch.setattr(module, "to_md", fake_to_md)
+
+def test_to_md_async_matches_to_md():
+    arr = np.arange(12).reshape(3, 4) / 7
+    output = asyncio.run(to_md_async(arr, precision=2))
+    assert output.data == to_md(arr, precision=2).data
+
+def test_display_order_is_call_order(displays, slow_to_md):
+    async def main():
+        # later calls finish rendering first
+        return await asyncio.gather(*[ajupyprint(x)
+                                      for x in [0.2, 0.1, 0.0]])
+
+    assert asyncio.run(main()) == [True, True, True]
+    assert displays == [("display", "0.2", None), ("display", "0.1", None),
+                        ("display", "0.0", None)]
+
+def test_newer_value_supersedes_pending_render(displays, slow_to_md,
+                                               module):
+    async def main():
+        first = asyncio.ensure_future(ajupyprint(0.2, display_id="loss"))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(ajupyprint(0.0, display_id="loss"))
+        return await first, await second
+
+    assert asyncio.run(main()) == (False, True)
+    assert displays == [("display", "0.0", "loss")]
+    assert module._pending_renders == {}
+
+def test_event_loop_not_blocked(displays, slow_to_md):
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(ajupyprint(0.2), ticker())
+
+    asyncio.run(main())
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.15
+    assert displays == [("display", "0.2", None)]
+
+def test_render_cancelled_between_row_blocks(module):
+    cancel = threading.Event()
+    cancel.set()
+    module._render_local.cancel = cancel
+    try:
+        with pytest.raises(module._RenderCancelled):
+            arraytex(np.zeros((100, 100)), threshold=np.inf)
+    finally:
+        module._render_local.cancel = None
+    assert arraytex(np.zeros((2, 2))) == \
+        "\\begin{bmatrix}{} 0.0 & 0.0 \\\\ 0.0 & 0.0 \\\\ \\end{bmatrix}"
+
+def test_cancelling_task_cancels_render(monkeypatch, module):
+    seen = {}
+
+    def fake_to_md(x, **options):
+        seen["cancel"] = module._render_local.cancel
+        time.sleep(0.1)
+        return FakeMarkdown(str(x))
+    monkeypatch.setattr(module, "to_md", fake_to_md)
+
+    async def main():
+        task = asyncio.ensure_future(to_md_async(1))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert seen["cancel"].is_set()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (jupyprint, jupyprint_many, batch, arraytex,
+                       dataframehtml)
+
+def test_batch_combines_outputs(displays):
+    arr = np.array([1, 2, 4])
+    with batch():
+        jupyprint("Hello")
+        jupyprint(arr)
+        jupyprint(42)
+        assert displays == []
+    assert len(displays) == 1
+    assert displays[0][1] == f"Hello\n\n${arraytex(arr)}$\n\n42"
+
+def test_batch_interleaves_dataframes(displays):
+    df = pd.DataFrame({'A': np.repeat('A', 3)})
+    jupyprint_many(["before", df, "after"])
+    assert len(displays) == 1
+    before, table, after = displays[0][1].split("\n\n")
+    assert (before, after) == ("before", "after")
+    assert table == dataframehtml(df)
+
+def test_batch_flushes_at_max_bytes(displays):
+    jupyprint_many([f"item {i}" for i in range(10)], max_bytes=12)
+    # each flush happens once two items ("item i" is 6 characters) are added
+    assert len(displays) == 5
+    parts = "\n\n".join(data for _, data, _ in displays).split("\n\n")
+    assert parts == [f"item {i}" for i in range(10)]
+
+def test_max_bytes_counts_utf8_bytes(displays):
+    # "αβγ" is 3 characters, but 6 bytes
+    jupyprint_many(["αβγ"] * 4, max_bytes=12)
+    assert len(displays) == 2
+
+def test_nested_batches_merge(displays):
+    with batch():
+        jupyprint("outer")
+        with batch():
+            jupyprint("inner")
+        assert displays == []
+    assert displays[0][1] == "outer\n\ninner"
+
+def test_no_batch_displays_immediately(displays):
+    jupyprint("a")
+    jupyprint("b")
+    assert [data for _, data, _ in displays] == ["a", "b"]
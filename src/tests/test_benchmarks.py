@@ -0,0 +1,31 @@
+import copy
+import sys
+import os
+
+# ensure jupyprint module and the benchmark suite are importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+benchmarks_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/benchmarks/"
+sys.path.append(package_dir)
+sys.path.append(benchmarks_dir)
+
+import bench_suite
+
+def test_suite_runs():
+    data = bench_suite.run(n_cells=16, repeats=1, shapes=["row", "square"])
+    # 2 shapes * 5 dtypes * 4 string options * 3 functions
+    assert len(data["results"]) == 120
+    for result in data["results"]:
+        assert result["time_s"] >= 0 and result["output_bytes"] > 0
+
+def test_compare_flags_regressions():
+    old = bench_suite.run(n_cells=16, repeats=1, dtypes=["int"],
+                          shapes=["row"])
+    new = copy.deepcopy(old)
+    assert bench_suite.compare(old, new) == []
+
+    new["results"][0]["time_s"] = old["results"][0]["time_s"] * 2
+    new["results"][1]["output_bytes"] += 1
+    regressions = bench_suite.compare(old, new, tolerance=0.5)
+    assert [key for key, _ in regressions] == \
+        [bench_suite.result_key(r) for r in new["results"][:2]]
@@ -0,0 +1,81 @@
+import numpy as np
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, to_md, RenderCache, render_cache
+
+def test_cache_disabled_by_default():
+    cache = RenderCache()
+    assert cache._key(np.arange(3), (True, True, 1000, 3)) is None
+    assert not render_cache.info()["enabled"]
+
+def test_cache_hits_and_mutation():
+    "Unchanged arrays are served from the cache, mutated ones re-rendered."
+    render_cache.enable()
+    try:
+        arr = np.arange(12).reshape(3, 4)
+        first = arraytex(arr)
+        assert arraytex(arr) == first
+        assert to_md(arr).data == f"${first}$"
+        info = render_cache.info()
+        assert (info["hits"], info["misses"], info["entries"]) == (2, 1, 1)
+
+        arr[0, 0] = 100
+        mutated = arraytex(arr)
+        assert mutated != first
+        assert mutated == arraytex(arr.copy())
+        assert render_cache.info()["misses"] == 2
+
+        # options, dtype and shape are all part of the key
+        assert arraytex(arr, quote_strings=False) == mutated
+        assert arraytex(arr.astype(float)) != mutated
+        assert arraytex(arr.reshape(4, 3)) != mutated
+        assert render_cache.info()["entries"] == 5
+    finally:
+        render_cache.disable()
+    assert render_cache.info()["entries"] == 0
+
+def test_cache_skips_object_and_summarized_arrays():
+    render_cache.enable()
+    try:
+        arraytex(np.array([1, "a"], dtype=object))
+        arraytex(np.arange(10000))
+        assert render_cache.info()["entries"] == 0
+    finally:
+        render_cache.disable()
+
+def test_cache_lru_eviction():
+    "Least recently used entries are evicted to keep within the budget."
+    cache = RenderCache()
+    entry_size = sys.getsizeof("x" * 100)
+    cache.enable(maxbytes=2 * entry_size)
+    for key in ["a", "b"]:
+        cache._put(key, key * 100)
+    assert cache._get("a") == "a" * 100
+    cache._put("c", "c" * 100)
+    assert cache._get("b") is None
+    assert cache._get("a") is not None and cache._get("c") is not None
+    info = cache.info()
+    assert info["entries"] == 2 and info["nbytes"] <= info["maxbytes"]
+
+    # entries over the budget are never stored
+    cache._put("d", "d" * 1000)
+    assert cache._get("d") is None
+
+    cache.clear()
+    assert cache.info()["entries"] == 0 and cache.info()["hits"] == 0
+
+def test_cache_keyed_on_mask():
+    render_cache.enable()
+    try:
+        arr = np.ma.masked_array([1.0, 2.0], mask=[False, False])
+        assert arraytex(arr) == "\\begin{bmatrix}{} 1.0 & 2.0 \\end{bmatrix}"
+        arr[1] = np.ma.masked
+        assert arraytex(arr) == "\\begin{bmatrix}{} 1.0 & nan \\end{bmatrix}"
+    finally:
+        render_cache.disable()
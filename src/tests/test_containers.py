@@ -0,0 +1,104 @@
+import io
+import numpy as np
+import pytest
+import sys
+import time
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (to_md, arraytex, printoptions, set_printoptions,
+                       export)
+
+def latex(x, **options):
+    "The LaTeX to_md() renders, without the $ delimiters."
+    return to_md(x, **options).data[1:-1]
+
+def test_numeric_sequences_are_arrays():
+    assert latex([1, 2, 3]) == arraytex(np.array([1, 2, 3]))
+    assert latex((0.5, 0.25)) == arraytex(np.array([0.5, 0.25]))
+    assert latex([[1, 2], [3, 4]]) == arraytex(np.array([[1, 2], [3, 4]]))
+    assert latex([0.1 + 0.2], precision=2) == \
+        "\\begin{bmatrix}{} 0.3 \\end{bmatrix}"
+    # mixed types are not converted (numpy would show 1 as 1.0, or "1")
+    assert latex([1, 2.5]) == "\\left[ 1, 2.5 \\right]"
+    assert latex([1, "a_b", None, True]) == \
+        "\\left[ 1, {\\tt'a\\_b'}, \\text{None}, \\text{True} \\right]"
+    assert latex([2**70]) == "\\left[ 1180591620717411303424 \\right]"
+
+def test_tuples_and_dicts():
+    assert latex((1, "a")) == "\\left( 1, {\\tt'a'} \\right)"
+    assert latex(("a",)) == "\\left( {\\tt'a'}, \\right)"
+    assert latex({"x y": 1, 2: [0.5, "b"]}, quote_strings=False) == (
+        "\\left\\{ \\begin{array}{rcl} {\\tt x~~y} & : & 1 \\\\ "
+        "2 & : & \\left[ 0.5, {\\tt b} \\right] \\end{array} \\right\\}")
+    assert latex([]) == "\\left[ \\right]"
+    assert latex({}) == "\\left\\{ \\right\\}"
+
+def test_long_containers_are_elided():
+    with printoptions(max_items=4):
+        assert latex(list("abcdefg"), quote_strings=False) == (
+            "\\left[ {\\tt a}, {\\tt b}, \\ldots, {\\tt f}, {\\tt g} "
+            "\\right]")
+        table = latex(dict(zip("abcdefg", range(7))))
+        assert table.count(" & : & ") == 4
+        assert "\\vdots & & \\vdots" in table
+
+def test_deep_nesting_and_cycles_are_elided():
+    with printoptions(max_depth=2):
+        assert latex(["a", ["b", ["c"]]], quote_strings=False) == \
+            "\\left[ {\\tt a}, \\left[ {\\tt b}, \\left[ \\ldots \\right] " \
+            "\\right] \\right]"
+    x = ["a"]
+    x.append(x)
+    assert latex(x, quote_strings=False) == \
+        "\\left[ {\\tt a}, \\left[ \\ldots \\right] \\right]"
+
+def test_cost_is_bounded():
+    output = latex(list(range(10**6)) + ["end"])
+    assert "\\ldots" in output and "{\\tt'end'}" in output
+    assert len(output) < 1000
+    # converted to one array, and summarized by arraytex()
+    assert latex([float(i) for i in range(10**6)]) == \
+        arraytex(np.arange(10**6, dtype=float))
+    # a total budget of `threshold` elements
+    with printoptions(threshold=10):
+        output = latex([["x", "y"]] * 100 + [[1, "a"]] * 100)
+    assert output.count("{\\tt'") <= 12
+
+def test_non_numeric_lists_not_scanned():
+    # only the first element's type is looked at, before eliding the rest
+    strings = ["s"] * 10**6
+    latex(strings[:10])
+    start = time.perf_counter()
+    output = latex(strings)
+    assert time.perf_counter() - start < 0.01
+    assert output.count("{\\tt's'}") == 50
+    assert latex([["a", 1], [1, 2]]) == \
+        "\\left[ \\left[ {\\tt'a'}, 1 \\right], " \
+        "\\begin{bmatrix}{} 1 & 2 \\end{bmatrix} \\right]"
+
+def test_repeated_sub_objects_rendered_once(monkeypatch, module):
+    rendered = []
+    element = module._NestedLatex._element
+    monkeypatch.setattr(module._NestedLatex, "_element",
+                        lambda self, el: rendered.append(el)
+                        or element(self, el))
+    row = [1, "a", None]
+    output = latex([row] * 20)
+    assert output.count("\\left[ 1, {\\tt'a'}, \\text{None} \\right]") == 20
+    assert rendered == row
+
+def test_export_containers():
+    f = io.StringIO()
+    export([[1, "a"]], f, format="tex")
+    assert f.getvalue() == "\\[ \\left[ 1, {\\tt'a'} \\right] \\]\n"
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        set_printoptions(max_depth=0)
+    with pytest.raises(ValueError):
+        set_printoptions(max_items=1)
@@ -0,0 +1,97 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (to_md, arraytex, dataframetex, dataframehtml,
+                       printoptions, collect_stats, export)
+
+def example_frame(n_rows=4):
+    return pd.DataFrame({"x": np.arange(n_rows) / 4,
+                         "label": ["a_b", "c d"] * (n_rows // 2),
+                         "flag": [True, False] * (n_rows // 2)})
+
+def test_bmatrix_matches_arraytex():
+    df = example_frame()
+    for param1 in [True, False]:
+        for param2 in [True, False]:
+            expected = arraytex(df.to_numpy(), quote_strings=param1,
+                                strings_in_typefont=param2)
+            assert dataframetex(df, environment="bmatrix",
+                                quote_strings=param1,
+                                strings_in_typefont=param2) == expected
+
+def test_array_with_labels():
+    df = pd.DataFrame({"a_1": [1, 2], "b": ["x", "y"]}, index=["r%", "s"])
+    assert dataframetex(df, quote_strings=False) == (
+        "\\begin{array}{r|rr}  & \\text{a\\_1} & \\text{b} \\\\ \\hline "
+        "\\text{r\\%} & 1 & {\\tt x} \\\\ \\text{s} & 2 & {\\tt y} \\\\ "
+        "\\end{array}")
+    assert dataframetex(df, environment="tabular", quote_strings=False) == (
+        "\\begin{tabular}{r|rr}  & a\\_1 & b \\\\ \\hline "
+        "r\\% & $1$ & ${\\tt x}$ \\\\ s & $2$ & ${\\tt y}$ \\\\ "
+        "\\end{tabular}")
+
+def test_html_with_labels():
+    df = pd.DataFrame({"a<b": [0.1 + 0.2], "c": ["x&y"]})
+    assert dataframehtml(df, precision=2) == (
+        '<table class="jupyprint"><tr><th><th>a&lt;b<th>c'
+        "<tr><th>0<td>0.3<td><code>'x&amp;y'</code></table>")
+
+def test_head_and_tail_windows():
+    df = pd.DataFrame(np.arange(60).reshape(10, 6))
+    html = dataframehtml(df, max_rows=4, max_columns=3)
+    rows = html.split("<tr>")[1:]
+    assert rows[0] == "<th><th>0<th>1<th>⋯<th>5"
+    assert rows[1] == "<th>0<td>0<td>1<td>⋯<td>5"
+    assert rows[3] == "<th>⋮<td>⋮<td>⋮<td>⋱<td>⋮"
+    assert rows[5] == "<th>9<td>54<td>55<td>⋯<td>59</table>"
+    latex = dataframetex(df, max_rows=4, max_columns=3)
+    assert latex.startswith("\\begin{array}{r|rrrr}")
+    assert "\\vdots & \\vdots & \\vdots & \\ddots & \\vdots \\\\" in latex
+
+def test_cost_independent_of_rows():
+    "Only the rows shown are converted."
+    for n_rows in [100, 10**6]:
+        df = example_frame(n_rows)
+        with collect_stats() as stats:
+            with printoptions(max_rows=10):
+                to_md(df)
+        assert stats["elements"] == 10 * 3
+
+def test_extension_dtypes():
+    df = pd.DataFrame({"n": pd.array([1, None], dtype="Int64"),
+                       "s": pd.array(["a", None], dtype="string"),
+                       "c": pd.Categorical(["u", "v"])})
+    assert dataframehtml(df, strings_in_typefont=False) == (
+        '<table class="jupyprint"><tr><th><th>n<th>s<th>c'
+        '<tr><th>0<td>1.0<td>"a"<td>"u"<tr><th>1<td>nan<td>nan<td>"v"'
+        "</table>")
+
+def test_to_md_modes_and_raw_string(capsys):
+    df = example_frame()
+    assert to_md(df).data == dataframehtml(df)
+    assert to_md(df, mode="latex", precision=1).data == \
+        f"${dataframetex(df, precision=1)}$"
+    output = to_md(df, return_raw_string=True)
+    assert capsys.readouterr().out == output.data + "\n"
+
+def test_export_dataframes():
+    df = example_frame()
+    f = io.StringIO()
+    export([df], f, format="tex")
+    assert f.getvalue() == dataframetex(df, environment="tabular") + "\n"
+    f = io.StringIO()
+    export([df], f, mode="html")
+    assert f.getvalue() == dataframehtml(df) + "\n"
+
+def test_invalid_environment():
+    with pytest.raises(ValueError):
+        dataframetex(example_frame(), environment="matrix")
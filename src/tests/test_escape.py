@@ -0,0 +1,88 @@
+import io
+import numpy as np
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, arrayhtml, to_md, export, printoptions
+
+# each LaTeX special character, with its escape in math mode (strings in
+# typewriter font) and in text mode
+ESCAPES = {"_": (r"\_", r"\_"),
+           "%": (r"\%", r"\%"),
+           "&": (r"\&", r"\&"),
+           "#": (r"\#", r"\#"),
+           "$": (r"\$", r"\$"),
+           "{": (r"\{", r"\{"),
+           "}": (r"\}", r"\}"),
+           "\\": (r"\backslash{}", r"\textbackslash{}"),
+           "^": (r"\hat{}", r"\textasciicircum{}"),
+           "~": (r"\sim{}", r"\textasciitilde{}")}
+
+WRAPPERS = {(True, True): (r"{\tt'", r"'}"),
+            (False, True): (r"{\tt ", r"}"),
+            (True, False): (r"\text{''", r"''}"),
+            (False, False): (r"\text{", r"}")}
+
+def expected_cell(char, quote_strings, strings_in_typefont):
+    prefix, suffix = WRAPPERS[(quote_strings, strings_in_typefont)]
+    escaped = ESCAPES[char][0 if strings_in_typefont else 1]
+    return prefix + "a" + escaped + "b" + suffix
+
+def test_every_special_character_in_every_mode():
+    for char in ESCAPES:
+        for param1 in [True, False]:
+            for param2 in [True, False]:
+                expected = ("\\begin{bmatrix}{} "
+                            + expected_cell(char, param1, param2)
+                            + " \\end{bmatrix}")
+                # vectorized (unicode) and element-wise (object) conversion
+                for arr in [np.array([f"a{char}b"]),
+                            np.array([f"a{char}b"], dtype=object)]:
+                    assert arraytex(arr, quote_strings=param1,
+                                    strings_in_typefont=param2) == expected
+
+def test_mixed_special_characters():
+    "Escapes are not themselves escaped again."
+    text = r"\{x}_1 & 50% #$^~"
+    cells = {True: r"{\tt'\backslash{}\{x\}\_1~~\&~~50\%~~\#\$\hat{}\sim{}'}",
+             False: (r"\text{''\textbackslash{}\{x\}\_1 \& 50\% "
+                     r"\#\$\textasciicircum{}\textasciitilde{}''}")}
+    for arr in [np.array([[text, "plain"]]),
+                np.array([[text, "plain"]], dtype=object)]:
+        for strings_in_typefont, cell in cells.items():
+            plain = "{\\tt'plain'}" if strings_in_typefont \
+                else "\\text{''plain''}"
+            assert arraytex(arr, strings_in_typefont=strings_in_typefont) == \
+                f"\\begin{{bmatrix}}{{}} {cell} & {plain} \\\\ \\end{{bmatrix}}"
+
+def test_contains_latex_is_not_escaped():
+    arr = np.array([r"\alpha_1", r"\frac{1}{2}"])
+    expected = ("\\begin{bmatrix}{} \\text{\\alpha_1} & "
+                "\\text{\\frac{1}{2}} \\end{bmatrix}")
+    assert arraytex(arr, contains_latex=True) == expected
+    assert arraytex(arr.astype(object), contains_latex=True) == expected
+    assert to_md(arr, contains_latex=True).data == f"${expected}$"
+    f = io.StringIO()
+    export([arr], f, contains_latex=True)
+    assert f.getvalue() == f"${expected}$\n"
+
+def test_summarized_and_streamed_output_escaped():
+    arr = np.array([f"x_{i}" for i in range(100)]).reshape(10, 10)
+    with printoptions(threshold=10, edgeitems=1):
+        latex = arraytex(arr)
+    assert r"{\tt'x\_0'}" in latex and r"{\tt'x\_99'}" in latex
+    assert "x_" not in latex
+    f = io.StringIO()
+    export([arr], f, threshold=np.inf)
+    assert f.getvalue() == f"${arraytex(arr, threshold=np.inf)}$\n"
+
+def test_html_escapes_not_truncated():
+    arr = np.array(["a&b", "x<y>z"])
+    assert arrayhtml(arr, strings_in_typefont=False) == \
+        ('<table class="jupyprint"><tr><td>"a&amp;b"<td>"x&lt;y&gt;z"'
+         '</table>')
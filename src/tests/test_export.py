@@ -0,0 +1,74 @@
+import io
+import numpy as np
+import pytest
+import sys
+import os
+import tracemalloc
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, arrayhtml, export, DocumentWriter
+
+class NullFile:
+    "File-like object discarding everything written, counting characters."
+    def __init__(self):
+        self.n_chars = 0
+
+    def write(self, text):
+        self.n_chars += len(text)
+
+def test_streamed_output_matches_arraytex():
+    arrays = [np.arange(5), np.arange(10).reshape(-1, 1),
+              np.arange(10000).reshape(100, 100),
+              np.array([["a b", "c"], ["d", "e"]]),
+              np.array([[True, False]] * 3000)]
+    for arr in arrays:
+        for threshold in [10, np.inf]:
+            f = io.StringIO()
+            export([arr], f, threshold=threshold, edgeitems=2)
+            assert f.getvalue() == \
+                f"${arraytex(arr, threshold=threshold, edgeitems=2)}$\n"
+
+            f = io.StringIO()
+            export([arr], f, mode="html", threshold=threshold, edgeitems=2)
+            assert f.getvalue() == \
+                arrayhtml(arr, threshold=threshold, edgeitems=2) + "\n"
+
+def test_export_many_values(tmp_path):
+    arr = np.array([[1, 2], [3, 4]])
+    path = tmp_path / "report.tex"
+    with DocumentWriter(path, quote_strings=False) as writer:
+        writer.write("Some text", arr)
+        writer.write(np.array(["x y"]))
+    assert path.read_text() == ("Some text\n\n"
+        f"\\[ {arraytex(arr)} \\]\n\n"
+        f"\\[ {arraytex(np.array(['x y']), quote_strings=False)} \\]\n")
+
+    path = tmp_path / "report.md"
+    export([42, arr], path)
+    assert path.read_text() == f"42\n\n${arraytex(arr)}$\n"
+
+def test_streaming_memory_bounded():
+    "Peak memory should not grow with the size of the output."
+    arr = np.random.default_rng(0).normal(size=(1000, 200))
+    sink = NullFile()
+    tracemalloc.start()
+    export([arr], sink, threshold=np.inf)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the output is ~4 MB, a block of rows is well under 1 MB
+    assert sink.n_chars > 3 * 2**20
+    assert peak < 2**20
+
+def test_rejected_file_left_untouched(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("important")
+    with pytest.raises(ValueError):
+        DocumentWriter(path)
+    with pytest.raises(ValueError):
+        DocumentWriter(tmp_path / "notes.md", mode="svg")
+    assert path.read_text() == "important"
+    assert not (tmp_path / "notes.md").exists()
@@ -0,0 +1,128 @@
+import numpy as np
+import sys
+import time
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, arrayhtml
+
+def reference_arraytex(arr, quote_strings=True, strings_in_typefont=True):
+    "The original, element-by-element, arraytex() renderer."
+    def needs_latex_text(el):
+        if isinstance(el, (bool, np.bool_)):
+            return r'\text{' + str(el) + r'}'
+        elif isinstance(el, (str, np.str_)) and quote_strings \
+            and strings_in_typefont:
+            return r"{\tt'" + str(el).replace(" ", "~~") + r"'}"
+        elif isinstance(el, (str, np.str_)) and not quote_strings \
+            and strings_in_typefont:
+            return r'{\tt ' + str(el).replace(" ", "~~") + r'}'
+        elif isinstance(el, (str, np.str_)) and quote_strings \
+            and not strings_in_typefont:
+            return r"\text{''" + str(el) + r"''}"
+        elif isinstance(el, (str, np.str_)):
+            return r'\text{' + str(el) + r'}'
+        return el
+
+    end_string = r" \\"
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+        end_string = ""
+    converted = np.array([needs_latex_text(el) for el in arr.flatten()])
+    converted = converted.reshape(arr.shape)
+    row_template = " & ".join(["{}"]*arr.shape[1]) + end_string
+    rows = [row_template.format(*row) for row in converted]
+    return "\\begin{bmatrix}{} " + ' '.join(rows) + " \\end{bmatrix}"
+
+def example_arrays():
+    "Arrays covering each dtype handled by the vectorized fast path."
+    rng = np.random.default_rng(42)
+    floats = rng.normal(size=(4, 3))
+    return [
+        np.array([1, 2, 4]),
+        np.array([[1], [2], [4]]),
+        np.array([[-3, 0, 2**62]]),
+        np.arange(12, dtype=np.uint8).reshape(3, 4),
+        floats,
+        floats.astype(np.float32),
+        floats.astype(np.float16),
+        np.array([[np.nan, np.inf], [-np.inf, -0.0], [1e20, 1e-7]]),
+        floats + 1j * floats[::-1],
+        (floats - 1j).astype(np.complex64),
+        np.array([True, True, False]),
+        np.array([[True], [False]]),
+        np.array([[1, 2, 4], ['A', 'B', 'C']]),
+        np.array(['True', '10', 'string with spaces', '', "it's"]),
+        np.array([[' lead', 'trail ', 'a  b']]),
+        np.array([1.5, 2.5]).reshape(2, 1)[::-1],
+        np.arange(20).reshape(4, 5)[::2, ::-2],
+        np.array([], dtype=float),
+        np.ma.masked_array(floats, mask=floats > 0.5),
+        np.ma.masked_array([[1.5], [2.5]], mask=[[False], [False]]),
+    ]
+
+def test_fast_path_matches_reference():
+    """The vectorized renderer should give byte-identical output to the
+    original element-by-element renderer.
+    """
+    for arr in example_arrays():
+        for param1 in [True, False]:
+            for param2 in [True, False]:
+                expected = reference_arraytex(arr, quote_strings=param1,
+                                              strings_in_typefont=param2)
+                assert arraytex(arr, quote_strings=param1,
+                                strings_in_typefont=param2) == expected
+
+def test_object_arrays_match_reference():
+    "Object arrays still use the element-by-element renderer."
+    arrays = [np.array([[10, "100", 200], [8, False, "two words"]],
+                       dtype=object),
+              np.array([1, 2.5, True], dtype=object),
+              np.array([[True], [False]], dtype=object)]
+    for arr in arrays:
+        for param1 in [True, False]:
+            for param2 in [True, False]:
+                expected = reference_arraytex(arr, quote_strings=param1,
+                                              strings_in_typefont=param2)
+                assert arraytex(arr, quote_strings=param1,
+                                strings_in_typefont=param2) == expected
+
+def test_object_numbers_coerced_across_blocks():
+    "Ints are shown as floats throughout, however the rows are split up."
+    arr = np.array([1] * 1100 + [1.5], dtype=object).reshape(-1, 1)
+    latex = arraytex(arr, threshold=np.inf)
+    assert latex == reference_arraytex(arr)
+    assert latex.count("1.0 \\\\") == 1100
+    assert arraytex(arr).startswith("\\begin{bmatrix}{} 1.0 \\\\ 1.0")
+    assert arrayhtml(arr, threshold=np.inf).count("<td>1.0") == 1100
+
+def test_object_ints_too_large_for_int64():
+    for elements in [[2**70, 1], [1, 2**70], [-2**63 - 1, 0.5]]:
+        arr = np.array(elements, dtype=object)
+        assert arraytex(arr) == reference_arraytex(arr)
+
+def test_summarized_object_arrays_only_look_at_shown_elements():
+    arr = np.full((2000, 2000), 1, dtype=object)
+    arr[-1, -1] = 1.5
+    start = time.perf_counter()
+    latex = arraytex(arr)
+    assert time.perf_counter() - start < 0.05
+    assert latex.startswith("\\begin{bmatrix}{} 1.0 & 1.0")
+    # (only the slices shown are looked at)
+    start = time.perf_counter()
+    arraytex(arr.reshape(1000, 2, 2000))
+    assert time.perf_counter() - start < 0.05
+
+def test_masked_elements_shown_as_nan():
+    arr = np.ma.masked_array([[1, 2], [3, 4]], mask=[[0, 1], [0, 0]])
+    assert arraytex(arr) == \
+        "\\begin{bmatrix}{} 1 & nan \\\\ 3 & 4 \\\\ \\end{bmatrix}"
+    assert arrayhtml(arr) == \
+        '<table class="jupyprint"><tr><td>1<td>nan<tr><td>3<td>4</table>'
+    strings = np.ma.masked_array(["a", "b"], mask=[True, False])
+    assert arraytex(strings, quote_strings=False) == \
+        "\\begin{bmatrix}{} nan & {\\tt b} \\end{bmatrix}"
@@ -0,0 +1,60 @@
+import numpy as np
+import sys
+import os
+import pytest
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import to_md, arraytex, arrayhtml, printoptions
+
+def test_html_table():
+    arr = np.array([[1, 2], [3, 4]])
+    assert arrayhtml(arr) == ('<table class="jupyprint">'
+        '<tr><td>1<td>2<tr><td>3<td>4</table>')
+    assert arrayhtml(np.array([True, False])) == ('<table class="jupyprint">'
+        '<tr><td>True<td>False</table>')
+
+def test_html_string_options():
+    arr = np.array(["a <b> & $c$"])
+    expected = {(True, True): "<code>'a &lt;b&gt; &amp; &#36;c&#36;'</code>",
+                (False, True): "<code>a &lt;b&gt; &amp; &#36;c&#36;</code>",
+                (True, False): '"a &lt;b&gt; &amp; &#36;c&#36;"',
+                (False, False): "a &lt;b&gt; &amp; &#36;c&#36;"}
+    for (param1, param2), cell in expected.items():
+        table = f'<table class="jupyprint"><tr><td>{cell}</table>'
+        assert arrayhtml(arr, quote_strings=param1,
+                         strings_in_typefont=param2) == table
+        # object arrays give the same output
+        assert arrayhtml(arr.astype(object), quote_strings=param1,
+                         strings_in_typefont=param2) == table
+
+def test_html_summarized():
+    arr = np.arange(100).reshape(10, 10)
+    assert arrayhtml(arr, threshold=10, edgeitems=1) == (
+        '<table class="jupyprint">'
+        '<tr><td>0<td>⋯<td>9'
+        '<tr><td>⋮<td>⋱<td>⋮'
+        '<tr><td>90<td>⋯<td>99</table>')
+
+def test_to_md_modes():
+    arr = np.arange(6).reshape(2, 3)
+    assert to_md(arr).data == f"${arraytex(arr)}$"
+    assert to_md(arr, mode="latex").data == f"${arraytex(arr)}$"
+    assert to_md(arr, mode="html").data == arrayhtml(arr)
+    with pytest.raises(ValueError):
+        to_md(arr, mode="svg")
+
+def test_to_md_auto_switches_to_html():
+    arr = np.arange(6).reshape(2, 3)
+    with printoptions(latex_max_cells=5):
+        assert to_md(arr).data == arrayhtml(arr)
+        assert to_md(arr, mode="latex").data == f"${arraytex(arr)}$"
+    with printoptions(latex_max_chars=10):
+        assert to_md(arr).data == arrayhtml(arr)
+    # summarized arrays are judged on the number of elements shown
+    big = np.zeros((1000, 1000))
+    with printoptions(latex_max_cells=49):
+        assert to_md(big).data.startswith("$")
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, ".."))
+
+# Imports jupyprint (after numpy, which it needs anyway) in a fresh
+# interpreter, printing the import time and whether pandas/IPython were loaded
+IMPORT_SCRIPT = f"""
+import sys
+import time
+import numpy
+sys.path.insert(0, {src_dir!r})
+start = time.perf_counter()
+import jupyprint
+elapsed = time.perf_counter() - start
+print(elapsed, "pandas" in sys.modules, "IPython" in sys.modules)
+"""
+
+def test_import_is_lazy():
+    "Importing jupyprint should not import pandas or IPython."
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT],
+                            capture_output=True, text=True, check=True).stdout
+    elapsed, pandas_imported, ipython_imported = output.split()
+    assert pandas_imported == "False"
+    assert ipython_imported == "False"
+    # generous budget, the import takes a few milliseconds
+    assert float(elapsed) < 0.25
+
+def test_dataframes_detected_once_pandas_imported():
+    script = IMPORT_SCRIPT + """
+import pandas as pd
+df = pd.DataFrame({"A": [1, 2]})
+assert jupyprint.to_md(df).data == jupyprint.dataframehtml(df)
+print("ok")
+"""
+    output = subprocess.run([sys.executable, "-c", script],
+                            capture_output=True, text=True, check=True).stdout
+    assert output.split()[-1] == "ok"
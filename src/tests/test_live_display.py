@@ -0,0 +1,73 @@
+import numpy as np
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import jupyprint, arraytex, arrayhtml, LiveDisplay
+
+def test_updates_replace_output(displays):
+    live = LiveDisplay(max_rate=None, display_id="params")
+    arr = np.zeros(3)
+    live.update(arr)
+    arr[0] = 1
+    live.update(arr)
+    assert displays == [("display", f"${arraytex(np.zeros(3))}$", "params"),
+                        ("update", f"${arraytex(arr)}$", "params")]
+
+def test_unchanged_values_skipped(displays):
+    live = LiveDisplay(max_rate=None)
+    arr = np.arange(4)
+    for _ in range(5):
+        live.update(arr)
+    live.update([1, 2])
+    live.update([1, 2])
+    assert len(displays) == 2
+    assert live.frames_shown == 2 and live.frames_skipped == 5
+
+def test_rate_limit_coalesces_and_flushes_final_value(displays):
+    # one frame every 1000 seconds - only the first is shown straight away
+    with LiveDisplay(max_rate=0.001) as live:
+        for i in range(100):
+            live.update(i)
+        assert [data for _, data, _ in displays] == ["0"]
+    assert [data for _, data, _ in displays] == ["0", "99"]
+    assert live.frames_shown == 2 and live.frames_skipped == 98
+
+def test_timer_flushes_pending_frame(displays):
+    live = LiveDisplay(max_rate=20)
+    live.update("first")
+    live.update("last")
+    timer = live._timer
+    timer.join(1)
+    assert [data for _, data, _ in displays] == ["first", "last"]
+
+def test_jupyprint_display_id(displays, module):
+    jupyprint("a", display_id="status")
+    module._live_displays["status"].max_rate = None
+    jupyprint("b", display_id="status")
+    assert displays == [("display", "a", "status"), ("update", "b", "status")]
+    module._live_displays.clear()
+
+def test_mode(displays, module):
+    arr = np.eye(2)
+    LiveDisplay(mode="html").update(arr)
+    jupyprint(arr, display_id="table", mode="html")
+    assert [data for _, data, _ in displays] == [arrayhtml(arr)] * 2
+    module._live_displays.clear()
+
+def test_number_options(displays, module):
+    arr = np.array([1 / 3, 2 / 3])
+    live = LiveDisplay(max_rate=None, precision=2)
+    live.update(arr)
+    live.precision = 3
+    live.update(arr)
+    jupyprint(arr, display_id="weights", significant=1)
+    assert [data for _, data, _ in displays] == [
+        f"${arraytex(arr, precision=2)}$", f"${arraytex(arr, precision=3)}$",
+        f"${arraytex(arr, significant=1)}$"]
+    assert module._live_displays["weights"].significant == 1
+    module._live_displays.clear()
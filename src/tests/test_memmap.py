@@ -0,0 +1,55 @@
+import numpy as np
+import sys
+import os
+import tracemalloc
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, export
+
+class NullFile:
+    "File-like object discarding everything written."
+    def write(self, text):
+        pass
+
+def make_memmap(tmp_path, shape=(2000, 500)):
+    "A disk-backed float64 array (of 8 MB, by default)."
+    mm = np.memmap(tmp_path / "data.dat", dtype=np.float64, mode="w+",
+                   shape=shape)
+    mm[:] = np.random.default_rng(0).normal(size=shape)
+    mm.flush()
+    return np.memmap(tmp_path / "data.dat", dtype=np.float64, mode="r",
+                     shape=shape)
+
+def peak_memory(function):
+    "Return (result, peak traced memory) of calling function()."
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+def test_strided_memmap_view(tmp_path):
+    mm = make_memmap(tmp_path)
+    view = mm[::10, ::3]
+    latex, peak = peak_memory(lambda: arraytex(view, threshold=np.inf))
+    assert latex == arraytex(np.array(view), threshold=np.inf)
+    # a copy of the (non-contiguous) view alone would be ~270 KB, the
+    # array as strings ~1.7 MB; peak memory is the output (and its rows) plus
+    # a block of rows
+    assert peak < 3 * len(latex) + 2**18
+
+def test_export_memmap_memory_ceiling(tmp_path):
+    mm = make_memmap(tmp_path, shape=(1000, 250))
+    _, peak = peak_memory(lambda: export([mm], NullFile(), threshold=np.inf))
+    # the array is 2 MB (its LaTeX ~5 MB), streaming holds a block of rows
+    assert peak < 2**20
+
+def test_digest_of_strided_view(tmp_path, module):
+    mm = make_memmap(tmp_path, shape=(300, 40))
+    view = mm[::7, ::3]
+    assert module._array_digest(view) == module._array_digest(np.array(view))
+    assert module._array_digest(view) != module._array_digest(mm[::7, 1::3])
@@ -0,0 +1,85 @@
+import io
+import numpy as np
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (to_md, arraytex, arrayhtml, printoptions,
+                       collect_stats, export)
+
+def test_labelled_slices():
+    arr = np.arange(8).reshape(2, 2, 2)
+    assert arraytex(arr) == (
+        "\\begin{array}{rl} "
+        "\\text{[0, :, :]} & " + arraytex(arr[0]) + " \\\\ "
+        "\\text{[1, :, :]} & " + arraytex(arr[1]) + " \\end{array}")
+    assert arrayhtml(arr, precision=1) == (
+        '<table class="jupyprint"><caption>[0, :, :]</caption>'
+        "<tr><td>0<td>1<tr><td>2<td>3</table>"
+        '<table class="jupyprint"><caption>[1, :, :]</caption>'
+        "<tr><td>4<td>5<tr><td>6<td>7</table>")
+    labels = [label.split("}")[0] for label in
+              arraytex(np.zeros((2, 3, 1, 1))).split("\\text{")[1:]]
+    assert labels == ["[0, 0, :, :]", "[0, 1, :, :]", "[0, 2, :, :]",
+                      "[1, 0, :, :]", "[1, 1, :, :]", "[1, 2, :, :]"]
+
+def test_summarized_like_numpy():
+    arr = np.arange(10**6).reshape(100, 100, 100)
+    latex = arraytex(arr, edgeitems=1)
+    assert latex == (
+        "\\begin{array}{rl} \\text{[0, :, :]} & "
+        + arraytex(arr[0], threshold=0, edgeitems=1)
+        + " \\\\ \\vdots & \\\\ \\text{[99, :, :]} & "
+        + arraytex(arr[99], threshold=0, edgeitems=1) + " \\end{array}")
+
+def test_cell_budget_elides_slices():
+    arr = np.arange(20 * 5 * 3 * 3).reshape(20, 5, 3, 3)
+    with printoptions(threshold=100):
+        with collect_stats() as stats:
+            latex = arraytex(arr)
+    # 11 slices of 9 elements fit within the budget: the first 6 and last 5
+    assert latex.count("\\begin{bmatrix}") == 11
+    assert stats["elements"] == 99
+    assert latex.count("\\vdots &") == 1
+    assert "[1, 0, :, :]" in latex and "[1, 1, :, :]" not in latex
+    assert "[19, 0, :, :]" in latex
+
+def test_slices_not_shown_are_not_touched():
+    # a (virtual) array of 10^15 elements, of which only 216 are shown
+    huge = np.lib.stride_tricks.as_strided(np.zeros(1),
+                                           shape=(10**9, 10**3, 10**3),
+                                           strides=(0, 0, 0))
+    with collect_stats() as stats:
+        output = to_md(huge)
+    assert stats["elements"] == 6 * 36
+    assert output.data.count("\\begin{bmatrix}") == 6
+
+def test_to_md_and_export():
+    arr = np.arange(24).reshape(2, 3, 4) / 4
+    assert to_md(arr).data == f"${arraytex(arr)}$"
+    assert to_md(arr, mode="html").data == arrayhtml(arr)
+    f = io.StringIO()
+    export([arr], f, format="tex")
+    assert f.getvalue() == f"\\[ {arraytex(arr)} \\]\n"
+
+def test_zero_dimensional():
+    with pytest.raises(ValueError):
+        arraytex(np.array(5))
+
+def test_zero_columns():
+    empty = "\\begin{bmatrix}{}  \\end{bmatrix}"
+    assert arraytex(np.zeros((3, 0))) == empty == arraytex(np.zeros(0))
+    assert to_md(np.zeros((3, 0))).data == f"${empty}$"
+    assert arraytex(np.zeros((2, 3, 0))).count(" & " + empty) == 2
+
+def test_no_slices():
+    arr = np.zeros((0, 3, 3))
+    assert arraytex(arr) == "\\begin{array}{rl}  \\end{array}"
+    assert to_md(arr, mode="html").data == arrayhtml(arr) == (
+        '<table class="jupyprint"><caption>shape (0, 3, 3)</caption>'
+        "</table>")
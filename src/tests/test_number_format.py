@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (arraytex, arrayhtml, to_md, printoptions,
+                       set_printoptions, get_printoptions, render_cache)
+
+def cells(latex):
+    "The elements of the LaTeX for a row vector."
+    return latex[len("\\begin{bmatrix}{} "):-len(" \\end{bmatrix}")] \
+        .split(" & ")
+
+def test_default_is_unchanged():
+    arr = np.array([0.1 + 0.2, 1e-20, 123456.789])
+    assert cells(arraytex(arr)) == [str(x) for x in arr]
+
+def test_precision():
+    arr = np.array([0.1 + 0.2, -0.0004, 123456.789, 2.0, np.nan, -np.inf])
+    assert cells(arraytex(arr, precision=3)) == \
+        ["0.3", "0.0", "123456.789", "2.0", "nan", "-inf"]
+    assert cells(arraytex(arr, precision=0)) == \
+        ["0.0", "0.0", "123457.0", "2.0", "nan", "-inf"]
+
+def test_precision_with_large_magnitudes():
+    biggest = np.finfo(float).max
+    arr = np.array([1e300, 0.5, biggest, -biggest, 2.0**53 + 2])
+    for precision in [2, 10, 300, 309, 400]:
+        assert cells(arraytex(arr, precision=precision)) == \
+            [str(x) for x in arr]
+    assert cells(arraytex(np.array([1e-300, 1 / 3, -1e-30]),
+                          precision=300)) == \
+        ["1e-300", "0.3333333333333333", "-1e-30"]
+    assert cells(arraytex(np.array([1e-300, 1e-30]), precision=25)) == \
+        ["0.0", "0.0"]
+    assert cells(arraytex(np.array([biggest, 0.5]), precision=400,
+                          scientific=True)) == ["1.7976931348623157e+308",
+                                                "5e-01"]
+
+def test_significant_matches_python():
+    rng = np.random.default_rng(0)
+    arr = rng.normal(size=2000) * 10.0 ** rng.integers(-40, 40, size=2000)
+    for significant in [1, 3, 6]:
+        shown = cells(arraytex(arr, significant=significant,
+                               threshold=np.inf))
+        assert [float(x) for x in shown] == \
+            [float(f"{x:.{significant}g}") for x in arr]
+    assert cells(arraytex(np.array([0.30000000000000004, 9.96, 1234.5]),
+                          significant=2)) == ["0.3", "10.0", "1200.0"]
+
+def test_scientific():
+    arr = np.array([1.5e-7, 2000.0, -0.000123456, 9.999, 0.0, np.inf])
+    assert cells(arraytex(arr, scientific=True, precision=2)) == \
+        ["1.5e-07", "2e+03", "-1.23e-04", "1e+01", "0e+00", "inf"]
+    assert cells(arraytex(arr, scientific=True, significant=2)) == \
+        ["1.5e-07", "2e+03", "-1.2e-04", "1e+01", "0e+00", "inf"]
+    assert cells(arraytex(np.array([5e-324, 1e300]), scientific=True)) == \
+        ["4.94065646e-324", "1e+300"]
+
+def test_suppress_small():
+    arr = np.array([1e-12, -1e-9, 0.5])
+    assert cells(arraytex(arr, suppress_small=True)) == ["0.0", "0.0", "0.5"]
+    assert cells(arraytex(arr, precision=2, suppress_small=True,
+                          scientific=True)) == ["0e+00", "0e+00", "5e-01"]
+
+def test_complex_float32_and_object_arrays():
+    assert cells(arraytex(np.array([1 + 2j, -0.1 - 0.30000000000000004j]),
+                          precision=2)) == ["(1.0+2.0j)", "(-0.1-0.3j)"]
+    assert cells(arraytex(np.array([0.1, 0.2], dtype=np.float32),
+                          precision=3)) == ["0.1", "0.2"]
+    arr = np.array([1, 0.30000000000000004, "a_b", True, 2j], dtype=object)
+    assert cells(arraytex(arr, precision=2)) == \
+        ["1", "0.3", r"{\tt'a\_b'}", r"\text{True}", "(0.0+2.0j)"]
+
+def test_html_and_to_md():
+    arr = np.array([[0.1 + 0.2, 1 / 3]])
+    assert arrayhtml(arr, precision=2) == \
+        '<table class="jupyprint"><tr><td>0.3<td>0.33</table>'
+    assert to_md(arr, precision=2).data == \
+        f"${arraytex(arr, precision=2)}$"
+    assert to_md(arr, precision=2, mode="html").data == \
+        arrayhtml(arr, precision=2)
+
+def test_global_print_options():
+    arr = np.array([0.1 + 0.2, 1 / 3])
+    with printoptions(precision=2):
+        assert get_printoptions()["precision"] == 2
+        assert cells(arraytex(arr)) == ["0.3", "0.33"]
+        assert cells(to_md(arr).data[1:-1]) == ["0.3", "0.33"]
+        # arguments take precedence over the global options
+        assert cells(arraytex(arr, precision=False)) == \
+            [str(x) for x in arr]
+        assert cells(arraytex(arr, significant=1)) == ["0.3", "0.3"]
+    assert get_printoptions()["precision"] is None
+    assert cells(arraytex(arr)) == [str(x) for x in arr]
+
+    with printoptions(significant=1, scientific=True):
+        set_printoptions(significant=False)
+        assert cells(arraytex(arr)) == ["3e-01", "3.33333333e-01"]
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        arraytex(np.ones(2), precision=-1)
+    with pytest.raises(ValueError):
+        set_printoptions(significant=0)
+    with pytest.raises(ValueError):
+        arraytex(np.ones(2), precision=True)
+    with pytest.raises(ValueError):
+        set_printoptions(significant=True)
+
+def test_cache_keyed_on_format():
+    arr = np.array([0.1 + 0.2, 1 / 3])
+    render_cache.enable()
+    try:
+        assert arraytex(arr) != arraytex(arr, precision=2)
+        assert arraytex(arr, precision=2) != arraytex(arr, precision=3)
+    finally:
+        render_cache.disable()
+        render_cache.clear()
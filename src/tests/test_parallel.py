@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import arraytex, to_md, printoptions
+
+@pytest.fixture
+def worker_pools(module):
+    yield
+    for pool in module._process_pools.values():
+        pool.shutdown()
+    module._process_pools.clear()
+
+def example_arrays():
+    rng = np.random.default_rng(0)
+    floats = rng.normal(size=(150, 40))
+    return [floats,
+            floats[::-2, ::3],
+            np.array([[1, "a_b", 2.5, True]] * 1500, dtype=object),
+            np.array([["x y", "50%"]] * 3000),
+            np.arange(6000).reshape(-1, 1),
+            np.array([1] * 3000 + [1.5], dtype=object).reshape(-1, 1),
+            np.arange(6000)]
+
+def test_parallel_matches_serial(worker_pools):
+    with printoptions(threshold=sys.maxsize, parallel_min_cells=1000):
+        for arr in example_arrays():
+            for options in [{}, {"quote_strings": False, "precision": 2},
+                            {"contains_latex": True}]:
+                assert arraytex(arr, processes=2, **options) == \
+                    arraytex(arr, **options)
+
+def test_global_option(worker_pools, module):
+    arr = example_arrays()[0]
+    with printoptions(threshold=sys.maxsize, parallel_min_cells=1000):
+        expected = to_md(arr, mode="latex").data
+        with printoptions(processes=2):
+            assert to_md(arr, mode="latex").data == expected
+    assert 2 in module._process_pools
+
+def test_small_and_summarized_arrays_are_serial(monkeypatch, module):
+    def fail(*args):
+        raise AssertionError("rendered in worker processes")
+    monkeypatch.setattr(module, "_parallel_rows", fail)
+    with printoptions(parallel_min_cells=1000):
+        arraytex(np.ones((10, 10)), processes=4)
+        arraytex(np.ones((1000, 1000)), processes=4)
+    with printoptions(threshold=sys.maxsize):
+        arraytex(np.ones((50, 50)), processes=4)
+
+def test_invalid_processes():
+    with pytest.raises(ValueError):
+        with printoptions(processes=0):
+            pass
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (Renderer, jupyprint, to_md, arraytex, printoptions,
+                       collect_stats)
+
+def example_arrays():
+    rng = np.random.default_rng(0)
+    return [np.arange(6),
+            np.arange(6).reshape(2, 3),
+            np.arange(6).reshape(6, 1),
+            rng.normal(size=(4, 4)),
+            rng.normal(size=(3, 3)).astype(np.float32),
+            np.array([1 + 2j, -0.5j]),
+            np.array([[True, False]]),
+            np.array([["a b", "x_1"], ["50%", "{}"]]),
+            np.array([[1, "a_b", 2.5, True, None]], dtype=object),
+            np.array([1.5, 2], dtype=object),
+            np.zeros((0, 3)),
+            np.zeros((3, 0)),
+            np.arange(32 * 32).reshape(32, 32)]
+
+OPTIONS = [{}, {"quote_strings": False}, {"strings_in_typefont": False},
+           {"contains_latex": True}, {"precision": 2},
+           {"significant": 3, "scientific": True}]
+
+def test_template_matches_full_render(module):
+    for arr in example_arrays():
+        for options in OPTIONS:
+            renderer = Renderer(**options)
+            escape = not options.pop("contains_latex", False)
+            if not escape:
+                options.update(quote_strings=False, strings_in_typefont=False)
+            number_format = module._number_format(
+                options.pop("precision", None),
+                options.pop("significant", None),
+                options.pop("scientific", None), None)
+            expected = module._arraytex(arr, escape=escape,
+                                        number_format=number_format,
+                                        **options)
+            assert renderer.arraytex(arr) == expected
+
+def test_matches_module_functions(displays):
+    arr = np.array([[0.5, "a_b"], [True, 3]], dtype=object)
+    renderer = Renderer(quote_strings=False, precision=1, mode="html")
+    assert renderer.arraytex(arr) == arraytex(arr, quote_strings=False,
+                                              precision=1)
+    assert renderer.to_md(arr).data == to_md(arr, quote_strings=False,
+                                             precision=1, mode="html").data
+    renderer.display(arr)
+    jupyprint(arr, quote_strings=False, precision=1, mode="html")
+    assert displays[0] == displays[1]
+
+def test_follows_global_print_options():
+    renderer = Renderer()
+    arr = np.arange(20) / 3
+    with printoptions(precision=1, threshold=10, edgeitems=2):
+        assert renderer.arraytex(arr) == \
+            "\\begin{bmatrix}{} 0.0 & 0.3 & \\cdots & 6.0 & 6.3 " \
+            "\\end{bmatrix}"
+    assert renderer.arraytex(arr) == arraytex(arr)
+    assert Renderer(precision=False).arraytex(arr[:2]) != \
+        Renderer(precision=0).arraytex(arr[:2])
+
+def test_slots_and_options():
+    renderer = Renderer(precision=3, mode="latex")
+    with pytest.raises(AttributeError):
+        renderer.precision = 2
+    assert renderer.options["precision"] == 3
+    assert renderer.options["mode"] == "latex"
+    with pytest.raises(ValueError):
+        Renderer(mode="svg")
+    with pytest.raises(ValueError):
+        Renderer(precision=-1)
+
+def test_profiled_calls_use_template(monkeypatch, module):
+    # collecting stats does not change which code runs
+    arr = np.eye(3)
+    renderer = Renderer()
+    full_render = module._arraytex
+    monkeypatch.setattr(module, "_arraytex", lambda *args, **kwargs:
+                        pytest.fail("rendered without the template"))
+    with collect_stats() as block_stats:
+        latex = renderer.arraytex(arr)
+    assert latex == full_render(arr)
+    assert block_stats["calls"] == {"arraytex": 1}
+    assert block_stats["elements"] == 9
+    assert set(block_stats["stages"]) == {"convert", "join"}
@@ -0,0 +1,75 @@
+import numpy as np
+import sys
+import os
+import pytest
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import to_md, arraytex, arrayhtml
+
+sparse = pytest.importorskip("scipy.sparse")
+
+def example_dense():
+    rng = np.random.default_rng(0)
+    dense = rng.normal(size=(40, 30))
+    dense[rng.random(dense.shape) > 0.1] = 0
+    return [dense, dense.round().astype(int), dense > 0,
+            dense[:, :1], dense[:1]]
+
+def test_sparse_matches_dense():
+    for dense in example_dense():
+        for fmt in ["csr", "csc", "coo"]:
+            matrix = sparse.coo_matrix(dense).asformat(fmt)
+            for threshold in [np.inf, 100]:
+                expected = arraytex(dense, threshold=threshold, edgeitems=2)
+                assert arraytex(matrix, threshold=threshold,
+                                edgeitems=2) == expected
+                assert arrayhtml(matrix, threshold=threshold, edgeitems=2) \
+                    == arrayhtml(dense, threshold=threshold, edgeitems=2)
+
+def test_duplicate_entries_summed():
+    matrix = sparse.coo_matrix(([1, 2, 5], ([0, 0, 1], [1, 1, 0])),
+                               shape=(2, 2))
+    csr = sparse.csr_matrix((matrix.data, matrix.col, [0, 2, 3]),
+                            shape=(2, 2))
+    assert not csr.has_canonical_format
+    expected = arraytex(np.array([[0, 3], [5, 0]]))
+    assert arraytex(matrix) == expected
+    assert arraytex(csr) == expected
+    # the user's matrix is left as it was
+    assert not csr.has_canonical_format
+
+def test_huge_sparse_summarized():
+    "Huge shapes are summarized without making a dense array."
+    n = 10**6
+    matrix = sparse.csr_matrix(([1.5, 2.5], ([0, n - 1], [0, n - 1])),
+                               shape=(n, n))
+    latex = to_md(matrix).data
+    assert latex.startswith(r"$\begin{bmatrix}{} 1.5 & 0.0 & 0.0 & \cdots")
+    assert r"\vdots & \vdots & \vdots & \ddots" in latex
+    assert latex.endswith(r"\cdots & 0.0 & 0.0 & 2.5 \\ \end{bmatrix}$")
+
+def test_1d_sparse_arrays():
+    if not hasattr(sparse, "coo_array"):
+        pytest.skip("scipy has no sparse arrays")
+    dense = np.array([0, 1.5, 0, 2] * 300)
+    vector = sparse.coo_array(dense)
+    if vector.ndim != 1:
+        pytest.skip("scipy has no 1-D sparse arrays")
+    for threshold in [np.inf, 10]:
+        assert arraytex(vector, threshold=threshold) == \
+            arraytex(dense, threshold=threshold)
+    assert to_md(vector).data == to_md(dense).data
+    assert to_md(vector, mode="html").data == to_md(dense, mode="html").data
+
+def test_dok_matrices_are_not_dicts():
+    dense = np.array([[0, 1.5], [2, 0]])
+    doks = [sparse.dok_matrix(dense)]
+    if hasattr(sparse, "dok_array"):
+        doks.append(sparse.dok_array(dense))
+    for dok in doks:
+        assert to_md(dok).data == to_md(dense).data
+        assert to_md([dok]).data == f"$\\left[ {arraytex(dense)} \\right]$"
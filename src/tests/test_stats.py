@@ -0,0 +1,52 @@
+import numpy as np
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (jupyprint, to_md, arraytex, stats, enable_stats,
+                       disable_stats, collect_stats, printoptions)
+
+def test_collect_stats_stages(displays):
+    arr = np.arange(12).reshape(3, 4)
+    records = []
+    with collect_stats(callback=records.append) as block_stats:
+        jupyprint(arr)
+        arraytex(arr)
+    assert block_stats["calls"] == {"jupyprint": 1, "arraytex": 1}
+    # (small arrays are filled into a template, without a cache lookup)
+    assert set(block_stats["stages"]) == {"convert", "join", "display"}
+    assert block_stats["elements"] == 24
+    assert [r["function"] for r in records] == ["jupyprint", "arraytex"]
+    # the displayed Markdown has "$" either side of the LaTeX
+    assert records[0]["output_bytes"] == records[1]["output_bytes"] + 2
+    assert block_stats["total_s"] == sum(r["total_s"] for r in records)
+
+def test_summarized_element_count():
+    with collect_stats() as block_stats:
+        with printoptions(threshold=10, edgeitems=2):
+            arraytex(np.zeros((100, 100)))
+    assert block_stats["elements"] == 16
+    assert "select" in block_stats["stages"]
+
+def test_global_stats():
+    stats(reset=True)
+    to_md("not profiled")
+    enable_stats()
+    try:
+        to_md(np.arange(3))
+        to_md(np.arange(3))
+    finally:
+        disable_stats()
+    to_md("not profiled")
+    snapshot = stats(reset=True)
+    assert snapshot["calls"] == {"to_md": 2}
+    assert snapshot["stages"]["convert"]["count"] == 2
+    assert stats()["calls"] == {}
+
+def test_no_stats_when_disabled(module):
+    assert not module._profiling
+    assert module._stage_start() is None
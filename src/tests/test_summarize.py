@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+# ensure jupyprint module is importable
+current_dir = os.path.dirname(os.path.abspath(__file__))
+package_dir = os.path.abspath(os.path.join(current_dir, ".."))+"/jupyprint/"
+sys.path.append(package_dir)
+
+from jupyprint import (arraytex, printoptions, get_printoptions,
+                       set_printoptions)
+
+def test_small_arrays_not_summarized():
+    "Arrays at or below the threshold show every element."
+    arr = np.arange(12).reshape(3, 4)
+    assert arraytex(arr, threshold=12) == (r"\begin{bmatrix}{} 0 & 1 & 2 & 3 \\"
+        r" 4 & 5 & 6 & 7 \\ 8 & 9 & 10 & 11 \\ \end{bmatrix}")
+
+def test_row_vector_summarized():
+    arr = np.arange(100)
+    assert arraytex(arr, threshold=10, edgeitems=2) == \
+        r"\begin{bmatrix}{} 0 & 1 & \cdots & 98 & 99 \end{bmatrix}"
+
+def test_column_vector_summarized():
+    arr = np.arange(100).reshape(-1, 1)
+    assert arraytex(arr, threshold=10, edgeitems=2) == (r"\begin{bmatrix}{} "
+        r"0 \\ 1 \\ \vdots \\ 98 \\ 99 \\ \end{bmatrix}")
+
+def test_matrix_summarized():
+    arr = np.arange(50 * 20).reshape(50, 20)
+    assert arraytex(arr, threshold=10, edgeitems=1) == (r"\begin{bmatrix}{} "
+        r"0 & \cdots & 19 \\ \vdots & \ddots & \vdots \\ "
+        r"980 & \cdots & 999 \\ \end{bmatrix}")
+
+def test_matrix_summarized_along_one_axis():
+    "Only dimensions longer than 2 * edgeitems are cut."
+    arr = np.arange(2 * 50).reshape(2, 50)
+    assert arraytex(arr, threshold=10, edgeitems=1) == (r"\begin{bmatrix}{} "
+        r"0 & \cdots & 49 \\ 50 & \cdots & 99 \\ \end{bmatrix}")
+
+def test_summarized_string_options():
+    "String options still apply to the elements which are shown."
+    arr = np.array([["a b"] * 10] * 10, dtype=object)
+    for param1 in [True, False]:
+        for param2 in [True, False]:
+            full = arraytex(arr[:1, :1], quote_strings=param1,
+                            strings_in_typefont=param2)
+            element = full[len(r"\begin{bmatrix}{} "):-len(r" \\ \end{bmatrix}")]
+            summary = arraytex(arr, quote_strings=param1,
+                               strings_in_typefont=param2, threshold=10,
+                               edgeitems=1)
+            assert summary == (r"\begin{bmatrix}{} "
+                f"{element} & \\cdots & {element} \\\\ "
+                r"\vdots & \ddots & \vdots \\ "
+                f"{element} & \\cdots & {element} \\\\ \\end{{bmatrix}}")
+
+def test_printoptions_context_manager():
+    arr = np.arange(100)
+    default = get_printoptions()
+    with printoptions(threshold=10, edgeitems=1):
+        assert arraytex(arr) == \
+            r"\begin{bmatrix}{} 0 & \cdots & 99 \end{bmatrix}"
+    assert get_printoptions() == default
+    assert r"\cdots" not in arraytex(arr)
+
+def test_invalid_options_leave_options_unchanged():
+    default = get_printoptions()
+    with pytest.raises(ValueError):
+        set_printoptions(threshold=10, edgeitems=0)
+    assert get_printoptions() == default
+    with pytest.raises(ValueError):
+        with printoptions(threshold=10, edgeitems=0):
+            pass
+    assert get_printoptions() == default